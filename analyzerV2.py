@@ -1,160 +1,271 @@
-import re
-import pandas as pd
-import pdfplumber
-from tkinter import Tk, Button, Label, filedialog, messagebox, StringVar, OptionMenu
-
-def extract_pdf_text(pdf_path):
-    with pdfplumber.open(pdf_path) as pdf:
-        full_text = ""
-        for page in pdf.pages:
-            full_text += page.extract_text()
-    return full_text
-
-def extract_saldo_inicial(full_text):
-    saldo_pattern = re.compile(r'S\s*aldo\s*inicial.*?\$\d{1,3}(?:,\d{3})*\.\d{2}', re.IGNORECASE)
-    match = saldo_pattern.search(full_text)
+import sys
+import os
+import argparse
+from datetime import date
+from functools import partial
+
+from lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+from extraction import extract_page_texts, extract_section_page_texts, join_page_texts
+from text_cache import file_sha256, get_text_cache
+from classify import BALANCE_COLUMN, OPENING_BALANCE_COLUMN, RECONCILIATION_COLUMN, classify_by_balance
+from line_parser import LineStateMachine, SingleLineParser, iter_lines
+from columnar import MovementColumns
+from detect import AUTO_BANK
+from writers import OUTPUT_FORMATS
+from geometry import geometry_layouts
+from banks import bank_spec, load_registry
+from ledger import DEFAULT_LEDGER_PATH
+from noise import client_keywords, noise_matcher
+from ocr import DEFAULT_DPI, DEFAULT_LANG, is_textless, ocr_cache_for, ocr_missing_pages
+from metrics import PROFILERS, append_metrics, count, span
+from patterns import (
+    AMOUNT_PATTERN,
+    CURRENCY_AMOUNT_PATTERN,
+    amount_to_cents,
+    find_amounts,
+    parse_amount,
+)
+
+root = None
+selected_bank = None
+use_cache = True
+metrics_log = None
+profile_dir = None
+profiler = "cprofile"
+ocr_options = None
+warning_sink = None
+active_runner = None
+job_results = []
+process_button = None
+cancel_button = None
+progress_bar = None
+status_text = None
+
+POLL_MS = 100
+
+def show_warning(title, message):
+    if warning_sink is not None:
+        warning_sink(title, message)
+    elif root is None:
+        print(f"{title}: {message}", file=sys.stderr)
+    else:
+        from tkinter import messagebox
+        messagebox.showwarning(title, message)
+
+ENGINES = ("text", "geometry")
+
+def section_for(bank, section_only=False):
+    spec = load_registry().get(bank)
+    if spec is not None and spec.section is not None and (section_only or spec.section_required):
+        return spec.section
+    return None
+
+def uses_geometry(bank, engine):
+    return engine == "geometry" and bank in geometry_layouts()
+
+def extract_pdf_pages(pdf_path, workers=1, cache=None, section=None, ocr_options=None, first_pages=None, file_digest=None):
+    with span("extract"):
+        lookups_before = (cache.hits, cache.misses) if cache is not None else None
+        if cache is not None and file_digest is None:
+            file_digest = file_sha256(pdf_path)
+        page_texts = extract_page_texts_for(pdf_path, workers, cache, section, first_pages, file_digest)
+        if ocr_options is not None:
+            if section is not None and any(is_textless(text) for text in page_texts):
+                page_texts = extract_page_texts_for(pdf_path, workers, cache, file_digest=file_digest)
+            page_texts = ocr_missing_pages(pdf_path, page_texts, *ocr_options, cache=ocr_cache_for(cache))
+        count("pages", len(page_texts))
+        if cache is not None:
+            count("cache_hits", cache.hits - lookups_before[0])
+            count("cache_misses", cache.misses - lookups_before[1])
+        return page_texts
+
+def extract_pdf_text(pdf_path, workers=1, cache=None, section=None, ocr_options=None, first_pages=None):
+    return join_page_texts(extract_pdf_pages(pdf_path, workers, cache, section, ocr_options, first_pages))
+
+def extract_page_texts_for(pdf_path, workers=1, cache=None, section=None, first_pages=None, file_digest=None):
+    if section is not None:
+        if cache is None:
+            page_texts = extract_section_page_texts(pdf_path, *section)
+        else:
+            page_texts = cache.page_texts(pdf_path, section=section, file_digest=file_digest)
+        if page_texts is not None:
+            return page_texts
+
+    if cache is None:
+        return extract_page_texts(pdf_path, workers=workers, first_pages=first_pages)
+    return cache.page_texts(pdf_path, workers=workers, first_pages=first_pages, file_digest=file_digest)
+
+def extract_saldo_inicial(full_text, pattern):
+    match = pattern.search(full_text)
     if match:
-        saldo_inicial = float(re.findall(r'\$\d{1,3}(?:,\d{3})*\.\d{2}', match.group())[0].replace('$', '').replace(',', ''))
-        return saldo_inicial
+        return amount_to_cents(CURRENCY_AMOUNT_PATTERN.search(match.group()).group())
     return None
 
+def with_balances(df, saldos, saldo_inicial):
+    if saldos is not None:
+        df[BALANCE_COLUMN] = pd.array(saldos, dtype="Int64")
+    df[OPENING_BALANCE_COLUMN] = pd.array([saldo_inicial] * len(df), dtype="Int64")
+    return df
+
 def extract_amounts_adjusted(description):
-    amounts = re.findall(r'\d{1,3}(?:,\d{3})*\.\d{2}', description)
+    amounts = find_amounts(description)
     if len(amounts) >= 2:
-        deposito_retiro = float(amounts[-2].replace(',',''))
-        saldo = float(amounts[-1].replace(',',''))
-        return deposito_retiro, saldo
+        return amounts[-2], amounts[-1]
     elif len(amounts) == 1:
-        return None, float(amounts[0].replace(',',''))
+        return None, amounts[0]
     else:
         return None, None
 
-def refine_and_capture_movements(full_text):
-    lines = full_text.split('\n')
-    movements = []
-    date_pattern = re.compile(r'^\d{2} \w{3}')
-    amount_pattern = re.compile(r'\$\d{1,3}(?:,\d{3})*\.\d{2}')
-    combined_line = ""
-    skip_next_line = False
-
-    for i, line in enumerate(lines):
-        line = line.strip()
-
-        if "Saldo" in line or "final" in line or "Comisionescobradas" in line or not line:
-            continue
-
-        if skip_next_line:
-            skip_next_line = False
-            continue
-
-        if "DEPOSITOS SBC CAMARA" in line:
-            combined_line = line.strip() + " " + lines[i + 1].strip()
-            skip_next_line = True
-            movements.append(combined_line)
-            combined_line = ""
-        elif date_pattern.match(line[:6]):
-            if combined_line:
-                movements.append(combined_line.strip())
-                combined_line = ""
-            combined_line = line.strip()
-        elif amount_pattern.search(line):
-            combined_line += " " + line.strip()
-        elif combined_line:
-            movements.append(combined_line.strip())
-            combined_line = ""
+class SpecParser:
+    bank = None
+
+    def __init__(self, spec=None):
+        self.spec = spec or bank_spec(self.bank)
+        super().__init__(self.spec.columns)
+
+class ScotiabankParser(SpecParser, LineStateMachine):
+    bank = "SCOTIABANK"
+
+    def __init__(self, spec=None):
+        super().__init__(spec)
+        self.skip_next_line = False
+        self.pending_camara = None
+        self.noise = noise_matcher(self.spec.name)
+
+    def normalize(self, line):
+        return line.strip()
+
+    def skip(self, line):
+        if not line or self.noise.search(line):
+            return True
+        if self.skip_next_line:
+            self.skip_next_line = False
+            return True
+        return False
+
+    def starts_row(self, line):
+        if self.spec.date_pattern.match(line[:6]):
+            return True
+        return self.current is None and CURRENCY_AMOUNT_PATTERN.search(line) is not None
+
+    def open_row(self, line):
+        return [line]
+
+    def continue_row(self, row, line):
+        if CURRENCY_AMOUNT_PATTERN.search(line):
+            row.append(line)
+            return True
+        return False
+
+    def emit(self, row):
+        self.rows.append(" ".join(row).strip())
+
+    def feed(self, line):
+        if self.pending_camara is not None:
+            self.rows.append(self.pending_camara + " " + line.strip())
+            self.pending_camara = None
+        super().feed(line)
+
+    def handle(self, line):
+        if self.spec.markers["camara"] in line:
+            self.current = None
+            self.pending_camara = line
+            self.skip_next_line = True
         else:
-            continue
+            super().handle(line)
 
-    if combined_line:
-        movements.append(combined_line.strip())
-    
-    return movements
+    def close(self):
+        if self.pending_camara is not None:
+            self.rows.append(self.pending_camara)
+            self.pending_camara = None
+        return super().close()
+
+def refine_and_capture_movements(full_text, spec=None):
+    return ScotiabankParser(spec).parse(iter_lines(full_text))
 
-def classify_movements_with_saldo_initial(movements, saldo_inicial):
-    movements_data = []
-    previous_saldo = saldo_inicial
+def classify_movements_with_saldo_initial(movements, saldo_inicial, retiro_on_tie=False):
+    fechas = []
+    conceptos = []
+    montos = []
+    saldos = []
 
     for movement in movements:
         parts = movement.split()
         if len(parts) > 4:
             try:
-                oper_date = " ".join(parts[:2])
-                concepto = " ".join(parts[2:-3]).strip()
-                retiro_deposito = float(parts[-2].replace('$','').replace(',',''))
-                saldo = float(parts[-1].replace('$','').replace(',',''))
-            
-
-                if saldo < previous_saldo:
-                    retiro = retiro_deposito
-                    deposito = 0
-                else:
-                    retiro = 0
-                    deposito = retiro_deposito
-
-                movement_info = {
-                    "Fecha": oper_date,
-                    "Concepto": concepto,
-                    "Depósito": deposito if deposito != 0 else 0,
-                    "Retiro": retiro if retiro != 0 else 0,
-                    "Saldo": saldo
-                }
-
-                movements_data.append(movement_info)
-                previous_saldo = saldo
+                retiro_deposito = parse_amount(parts[-2])
+                saldo = parse_amount(parts[-1])
             except ValueError:
+                count("lines_rejected")
                 continue
-    return pd.DataFrame(movements_data)
+            fechas.append(" ".join(parts[:2]))
+            conceptos.append(" ".join(parts[2:-3]).strip())
+            montos.append(retiro_deposito)
+            saldos.append(saldo)
+
+    if not fechas:
+        return pd.DataFrame()
+
+    _, retiros, depositos, descuadre = classify_by_balance(montos, saldos, saldo_inicial, retiro_on_tie=retiro_on_tie)
+    return pd.DataFrame({
+        "Fecha": fechas,
+        "Concepto": conceptos,
+        "Depósito": depositos,
+        "Retiro": retiros,
+        "Saldo": pd.array(saldos, dtype="Int64"),
+        RECONCILIATION_COLUMN: descuadre,
+    })
 
 
-def extract_date_info(full_text):
-    date_info_pattern = re.compile(r'del \d{2} al \d{2} de (\w+) (\d{4})')
-    match = date_info_pattern.search(full_text)
+def extract_date_info(full_text, pattern):
+    match = pattern.search(full_text)
     if match:
         month = match.group(1)
         year = match.group(2)
         return month, year
     return None, None
 
-def clean_text(full_text):
-    lines = full_text.split('\n')
-    cleaned_lines = []
-
-    for line in lines:
-        if not any(keyword in line for keyword in [
-            "000180.B07CHDA008.OD.0731.01",
-            "ESTADOS DE CUENTA AL",
-            "CLIENTE:",
-            "Página:",
-            "GRUPO SUNEGO DE PUEBLA SA DE CV",
-            "DETALLE DE OPERACIONES",
-            "FECHA CONCEPTO RETIROS DEPOSITOS SALDO"
-        ]):
-            cleaned_lines.append(line)
-    return '\n'.join(cleaned_lines)
-
-def extract_movements_section(full_text):
-    start_marker = "Detalle de movimientos cuenta de cheques."
-    end_marker = "Detalles de movimientos Dinero Creciente Santander."
+def clean_lines(lines, bank="BANAMEX"):
+    removed = 0
+    search = noise_matcher(bank).search
+    try:
+        for line in lines:
+            if search(line):
+                removed += 1
+            else:
+                yield line
+    finally:
+        count("lines_noise", removed)
+
+def clean_text(full_text, bank="BANAMEX"):
+    return '\n'.join(clean_lines(iter_lines(full_text), bank))
+
+def extract_section(full_text, start_marker, end_marker):
     start_index = full_text.find(start_marker)
     end_index = full_text.find(end_marker)
     if start_index != -1 and end_index != -1:
         return full_text[start_index:end_index]
     else:
         return ""
-    
-def extract_and_format_movements_flexible(movements_section):
-    saldo_pattern = re.compile(r'SALDOFINALDELPERIODOANTERIOR:\s*\$(\d{1,3}(?:,\d{3})*\.\d{2})')
-    match = saldo_pattern.search(movements_section)
-    saldo_anterior = float(match.group(1).replace(',','')) if match else None
 
-    movement_pattern = re.compile(r'(\d{2}-[A-Z]{3}-\d{4})\s+(\d+)([A-Z\s]+)\s+(.+?)\s+(\d{1,3}(?:,\d{3})*\.\d{2})\s+(\d{1,3}(?:,\d{3})*\.\d{2})')
-    movimientos = []
+def extract_movements_section(full_text, spec=None):
+    return extract_section(full_text, *(spec or bank_spec("SANTANDER")).section)
+
+def extract_and_format_movements_flexible(movements_section, spec=None):
+    spec = spec or bank_spec("SANTANDER")
+    match = spec.patterns["saldo_anterior"].search(movements_section)
+    saldo_anterior = amount_to_cents(match.group(1)) if match else None
 
-    for m in movement_pattern.finditer(movements_section):
+    movimientos = MovementColumns(spec.columns)
+
+    for m in spec.patterns["movimiento"].finditer(movements_section):
         fecha = m.group(1)
         descripcion = m.group(4).strip()
-        monto = float(m.group(5).replace(',',''))
-        saldo = float(m.group(6).replace(',',''))
+        monto = amount_to_cents(m.group(5))
+        saldo = amount_to_cents(m.group(6))
 
         movimientos.append({
             'Fecha': fecha,
@@ -163,427 +274,659 @@ def extract_and_format_movements_flexible(movements_section):
             'Saldo': saldo
         })
 
-    return saldo_anterior, pd.DataFrame(movimientos)
+    return saldo_anterior, movimientos
 
-def classify_movements(df_movimientos, saldo_anterior):
-    df_movimientos['Tipo'] = ''
-    df_movimientos['Retiro'] = 0.0
-    df_movimientos['Depósito'] = 0.0
+def classify_movements(movimientos, saldo_anterior, retiro_on_tie=False):
+    es_retiro, retiros, depositos, descuadre = classify_by_balance(movimientos.column('Monto'), movimientos.column('Saldo'), saldo_anterior,
+                                                                   retiro_on_tie=retiro_on_tie)
 
-    for i, row in df_movimientos.iterrows():
-        if row['Saldo'] < saldo_anterior:
-            df_movimientos.at[i, 'Tipo'] = 'Retiro'
-            df_movimientos.at[i, 'Retiro'] = row['Monto']
-        else:
-            df_movimientos.at[i, 'Tipo'] = 'Depósito'
-            df_movimientos.at[i, 'Depósito'] = row['Monto']
+    df_movimientos = movimientos.to_frame()
+    df_movimientos['Tipo'] = np.where(es_retiro, 'Retiro', 'Depósito')
+    df_movimientos['Retiro'] = retiros
+    df_movimientos['Depósito'] = depositos
+    df_movimientos[RECONCILIATION_COLUMN] = descuadre
 
-        saldo_anterior = row['Saldo']
-    
     return df_movimientos
 
 def extract_movements_azteca(full_text):
-    start_marker = "Detalle de movimientos realizados"
-    end_marker = "Revise cuidadosamente éste Estado de Cuenta."
-    start_index = full_text.find(start_marker)
-    end_index = full_text.find(end_marker)
-
-    if start_index != -1 and end_index != -1:
-        return full_text[start_index:end_index]
-    else:
-        return ""
+    return extract_section(full_text, *bank_spec("BANCOAZTE").section)
     
 def extract_movements_inbursa(full_text):
-    start_marker = "Detalle de movimientos"
-    end_marker = "Si desea recibir pagos a través"
-    start_index = full_text.find(start_marker)
-    end_index = full_text.find(end_marker)
-
-    if start_index != -1 and end_index != -1:
-        return full_text[start_index:end_index]
-    else:
-        return ""
+    return extract_section(full_text, *bank_spec("INBURSA").section)
     
-def process_banamex_pdf(cleaned_text):
-    lines = cleaned_text.split('\n')
-    movements = []
-    current_movement = {
-        "Fecha": "",
-        "Concepto": "",
-        "Retiro": 0.0,
-        "Depósito": 0.0,
-        "Saldo": 0.0
-    }
-    combine_next_line = False
-
-    for line in lines:
-        line = line.strip()
-
-        if "SALDO MINIMO REQUERIDO" in line:
-            if current_movement["Fecha"]:
-                movements.append(current_movement)
-            break
-
-        if re.match(r'\d{2} \w{3}', line[:6]) and not combine_next_line:
-            if current_movement["Fecha"]:
-                movements.append(current_movement)
-            current_movement = {
-                "Fecha": "",
-                "Concepto": "",
-                "Retiro": 0.0,
-                "Depósito": 0.0,
-                "Saldo": 0.0
-            }
-            current_movement["Fecha"] = line[:6]
-            current_movement["Concepto"] = line[7:].strip()
-        else:
-            if re.search(r'\d{1,3}(?:,\d{3})*\.\d{2}', line):
-                numbers = re.findall(r'\d{1,3}(?:,\d{3})*\.\d{2}', line)
-                if len(numbers) == 3:
-                    current_movement["Retiro"] = float(numbers[-3].replace(',', ''))
-                    current_movement["Saldo"] = float(numbers[-1].replace(',', ''))
-                    current_movement["Depósito"] = 0.0
-                elif len(numbers) == 2:
-                    current_movement["Saldo"] = float(numbers[-1].replace(',', ''))
-                    monto = float(numbers[-2].replace(',', ''))
-                elif len(numbers) == 1:
-                    monto = float(numbers[-1].replace(',', ''))
-                    current_movement["Saldo"] = 0.0
-
-                concepto = current_movement["Concepto"].upper()
-                if any(keyword in concepto for keyword in ["PAGO RECIBIDO", "ABONO", "DEPOSITO", "TRASPASO REF"]):
-                    current_movement["Depósito"] = monto
-                elif any(keyword in concepto for keyword in [
-                    "PAGO A", "COMPRA", "RETIRO", "COMISION", "IVA COMISION", 
-                    "DOMI AMERICAN EXPRESS", "COBRO IMP TPV GPRS", "COBRO COMI TPV GPRS", 
-                    "COMPRA INVERSION INTEGRAL", "PAGO INTERBANCARIO A BBVA MEXICO", 
-                    "COBRO IMP COM CUOT BJA FAC", "COBRO COM CUOT BJA FAC",
-                    "PAGO INTERBANCARIO A BANORTE", "PAGO INTERBANCARIO A SANTANDER",
-                    "PAGO INTERBANCARIO A BAJIO"]):
-                    current_movement["Retiro"] = monto
-                else:
-                    current_movement["Retiro"] = 0.0
-                    current_movement["Depósito"] = 0.0
-                combine_next_line = False
-            else:
-                current_movement["Concepto"] += " " + line.strip()
-                combine_next_line = True
 
-    if current_movement["Fecha"] and current_movement not in movements:
-        movements.append(current_movement)
+def new_banamex_movement(fecha="", concepto=""):
+    return {
+        "Fecha": fecha,
+        "Concepto": concepto,
+        "Retiro": 0,
+        "Depósito": 0,
+        "Saldo": 0
+    }
 
-    df = pd.DataFrame(movements)
-    return df
+class BanamexParser(SpecParser, LineStateMachine):
+    bank = "BANAMEX"
+
+    def __init__(self, spec=None):
+        super().__init__(spec)
+        self.current = new_banamex_movement()
+        self.combine_next_line = False
+        self.monto = 0
+
+    def normalize(self, line):
+        return line.strip()
+
+    def stop(self, line):
+        return self.spec.markers["fin"] in line
+
+    def starts_row(self, line):
+        return self.spec.date_pattern.match(line[:6]) and not self.combine_next_line
+
+    def open_row(self, line):
+        return new_banamex_movement(line[:6], line[7:].strip())
+
+    def continue_row(self, movement, line):
+        numbers = find_amounts(line)
+        if not numbers:
+            movement["Concepto"] += " " + line
+            self.combine_next_line = True
+            return True
+
+        if len(numbers) == 3:
+            movement["Retiro"] = numbers[-3]
+            movement["Saldo"] = numbers[-1]
+            movement["Depósito"] = 0
+        elif len(numbers) == 2:
+            movement["Saldo"] = numbers[-1]
+            self.monto = numbers[-2]
+        elif len(numbers) == 1:
+            self.monto = numbers[-1]
+            movement["Saldo"] = 0
+
+        concepto = movement["Concepto"].upper()
+        if self.spec.deposits.search(concepto):
+            movement["Depósito"] = self.monto
+        elif self.spec.withdrawals.search(concepto):
+            movement["Retiro"] = self.monto
+        else:
+            movement["Retiro"] = 0
+            movement["Depósito"] = 0
+        self.combine_next_line = False
+        return True
+
+    def emit(self, movement):
+        if movement["Fecha"]:
+            self.rows.append(movement)
+
+def process_banamex_pdf(full_text, spec=None):
+    spec = spec or bank_spec("BANAMEX")
+    movements = BanamexParser(spec).parse(clean_lines(iter_lines(full_text), spec.name))
+    return movements.to_frame()
+
+class PositionalLineParser(SpecParser, SingleLineParser):
+    def parse_row(self, line):
+        if not self.spec.date_pattern.match(line):
+            return None
+        parts = line.split()
+        if len(parts) < self.spec.min_words:
+            return None
+        row = {}
+        for name, kind in self.spec.columns.items():
+            text = " ".join(parts[self.spec.positions[name]])
+            row[name] = text if kind == "text" else parse_amount(text)
+        return row
+
+def process_line_pdf(full_text, spec):
+    movements = PositionalLineParser(spec).parse(iter_lines(full_text))
+    if not spec.balance_signs or not movements:
+        return movements.to_frame()
+
+    df_movements = movements.to_frame()
+    _, retiros, depositos, descuadre = classify_by_balance(movements.column("Monto"), movements.column("Saldo"), None,
+                                                           retiro_on_tie=spec.retiro_on_tie)
+    df_movements = df_movements.drop(columns=["Monto"])
+    df_movements["Retiro"] = retiros
+    df_movements["Depósito"] = depositos
+    df_movements[RECONCILIATION_COLUMN] = descuadre
+    return df_movements
+
+class BancomerParser(SpecParser, SingleLineParser):
+    bank = "BANCOMER"
+
+    def normalize(self, line):
+        return line.strip()
+
+    def parse_row(self, line):
+        if not self.spec.date_pattern.match(line):
+            return None
+        parts = line.split()
+        if len(parts) <= 2:
+            return None
 
-def process_bancoazte_pdf(full_text):
-    lines = full_text.split('\n')
-    movements_data = []
-
-    for line in lines:
-        if re.match(r'\d{4}-\d{2}-\d{2}', line):
-            parts = line.split()
-            if len(parts) > 5:
-                fecha_op = parts[0]
-                concepto = " ".join(parts[4:-3])
-                cargo = float(parts[-3].replace(',','')) if float(parts[-3].replace(',','')) != 0.00 else 0.0
-                abono = float(parts[-2].replace(',','')) if float(parts[-2].replace(',','')) != 0.00 else 0.0
-
-                movements_info = {
-                    "Fecha Operación": fecha_op,
-                    "Concepto": concepto,
-                    "Cargo": cargo,
-                    "Abono": abono
-                }
-                movements_data.append(movements_info)
-            
-    return pd.DataFrame(movements_data)
-
-def process_bancomer_pdf(full_text):
-    lines = full_text.split('\n')
-
-    movements = []
-    movements_data = []
-
-    date_pattern = re.compile(r'\d{2}/\w{3}')
-
-    for line in lines:
-        if date_pattern.match(line.strip()):
-            movements.append(line.strip())
+        amounts = [part for part in parts if AMOUNT_PATTERN.match(part)]
+        description_end_index = parts.index(amounts[0]) if amounts else len(parts)
+        description = " ".join(parts[2:description_end_index])
 
-    for movement in movements:
-        parts = movement.split()
-        if len(parts) > 2:
-            oper_date = parts[0]
-            amounts = [part for part in parts if re.match(r'\d{1,3}(?:,\d{3})*\.\d{2}', part)]
-            description_end_index = parts.index(amounts[0]) if amounts else len(parts)
-            description = " ".join(parts[2:description_end_index])
-
-            cargo = "0"
-            abono = "0"
-            
-            if any(keyword in description.lower() for keyword in ["abono", "depósito", "traspaso", "recibidos"]):
-                abono = amounts[0]
+        cargo = "0"
+        abono = "0"
+        if self.spec.deposits.search(description.lower()):
+            abono = amounts[0]
+        else:
+            cargo = amounts[0]
+
+        return {
+            "Operación": parts[0],
+            "Descripción": description,
+            "Cargos": cargo,
+            "Abonos": abono
+        }
+
+def process_bancomer_pdf(full_text, spec=None):
+    return BancomerParser(spec).parse(iter_lines(full_text)).to_frame()
+
+class BanorteParser(SpecParser, LineStateMachine):
+    bank = "BANORTE"
+
+    def starts_row(self, line):
+        return self.spec.date_pattern.match(line)
+
+    def open_row(self, line):
+        return {"Fecha": line[:9], "Descripción": line[9:].strip()}
+
+    def continue_row(self, entry, line):
+        amounts = find_amounts(line)
+        if len(amounts) == 2:
+            entry["Monto"] = amounts[0]
+            entry["Saldo"] = amounts[1]
+        elif len(amounts) == 1:
+            if "Monto" not in entry:
+                entry["Monto"] = amounts[0]
             else:
-                cargo = amounts[0]
-
-            movement_info = {
-                "Operación": oper_date,
-                "Descripción": description,
-                "Cargos": cargo,
-                "Abonos": abono
-            }
-
-            movements_data.append(movement_info)
-
-    return pd.DataFrame(movements_data)
-
-def process_banorte_pdf(full_text):
-    lines = full_text.split('\n')
-
-    date_pattern = re.compile(r'^\d{2}-[A-Z]{3}-\d{2}')
-    amount_pattern = re.compile(r'\d{1,3}(?:,\d{3})*\.\d{2}')
-
-    movements = []
-    current_entry = None
-
-    for line in lines:
-        if date_pattern.match(line):
-            if current_entry:
-                movements.append(current_entry)
-            current_entry = {"Fecha": line[:9], "Descripción": line[9:].strip()}
-        elif current_entry and amount_pattern.search(line):
-            amounts = amount_pattern.findall(line)
-            if len(amounts) == 2:
-                current_entry["Monto"] = float(amounts[0].replace(',', ''))
-                current_entry["Saldo"] = float(amounts[1].replace(',', ''))
-            elif len(amounts) == 1:
-                if "Monto" not in current_entry:
-                    current_entry["Monto"] = float(amounts[0].replace(',', ''))
-                else:
-                    current_entry["Saldo"] = float(amounts[0].replace(',', ''))
-        elif current_entry:
-            current_entry["Descripción"] += " " + line.strip()
-    
-    if current_entry:
-        movements.append(current_entry)
+                entry["Saldo"] = amounts[0]
+        elif not amounts:
+            entry["Descripción"] += " " + line.strip()
+        return True
+
+def process_banorte_pdf(full_text, spec=None):
+    spec = spec or bank_spec("BANORTE")
+    movements = BanorteParser(spec).parse(iter_lines(full_text))
+    saldo_anterior = spec.markers["saldo_anterior"]
 
-    df_movements = pd.DataFrame(movements)
+    df_movements = movements.to_frame()
 
     if df_movements.empty:
         print("No se encontraron movimientos.")
         return pd.DataFrame()
 
-    saldo_anterior_entry = df_movements[df_movements['Descripción'].str.contains('SALDO ANTERIOR', case=False)]
+    saldo_anterior_entry = df_movements[df_movements['Descripción'].str.contains(saldo_anterior, case=False, regex=False)]
     if not saldo_anterior_entry.empty:
-        saldo_inicial = float(re.findall(r'\d{1,3}(?:,\d{3})*\.\d{2}', saldo_anterior_entry['Descripción'].values[0])[0].replace(',', ''))
+        saldo_inicial = find_amounts(saldo_anterior_entry['Descripción'].values[0])[0]
     else:
         saldo_inicial = None
-    df_movements_filtered = df_movements[~df_movements['Descripción'].str.contains('SALDO ANTERIOR', case=False)]
+    df_movements_filtered = df_movements[~df_movements['Descripción'].str.contains(saldo_anterior, case=False, regex=False)]
 
-    df_movements_filtered[['Depósito/Retiro', 'Saldo']] = df_movements_filtered['Descripción'].apply(lambda x: pd.Series(extract_amounts_adjusted(x)))
+    amounts = [extract_amounts_adjusted(descripcion) for descripcion in df_movements_filtered['Descripción']]
+    montos = pd.array([monto for monto, _ in amounts], dtype="Int64")
+    saldos = pd.array([saldo for _, saldo in amounts], dtype="Int64")
 
-    saldo_actual = saldo_inicial  
+    _, retiros, depositos, descuadre = classify_by_balance(montos, saldos, saldo_inicial, retiro_on_tie=spec.retiro_on_tie)
 
-    df_movements_filtered['Tipo'] = None
-    for i, row in df_movements_filtered.iterrows():
-        if row['Saldo'] < saldo_actual:
-            df_movements_filtered.at[i, 'Tipo'] = 'Retiro'
-        else:
-            df_movements_filtered.at[i, 'Tipo'] = 'Depósito'
-        saldo_actual = row['Saldo']
-
-    df_movements_filtered['Retiro'] = df_movements_filtered.apply(lambda x: x['Depósito/Retiro'] if x['Tipo'] == 'Retiro' else 0, axis=1)
-    df_movements_filtered['Depósito'] = df_movements_filtered.apply(lambda x: x['Depósito/Retiro'] if x['Tipo'] == 'Depósito' else 0, axis=1)
+    df_movements_final = df_movements_filtered[['Fecha', 'Descripción']].copy()
+    df_movements_final['Retiro'] = retiros
+    df_movements_final['Depósito'] = depositos
+    df_movements_final[RECONCILIATION_COLUMN] = descuadre
 
-    df_movements_final = df_movements_filtered.drop(columns=['Depósito/Retiro', 'Monto', 'Saldo', 'Tipo'])
+    return with_balances(df_movements_final, saldos, saldo_inicial)
 
-    return df_movements_final
+class BanregioParser(SpecParser, SingleLineParser):
+    bank = "BANREGIO"
 
-def process_banregio_pdf(full_text):
-    month, year = extract_date_info(full_text)
-    
-    if not month or not year:
-        messagebox.showwarning("Advertencia", "No se pudo encontrar la información del mes y año en el estado de cuenta.")
-        return pd.DataFrame()
-    
-    lines = full_text.split('\n')
-    movements = []
-    movements_data = []
+    def __init__(self, spec=None):
+        super().__init__(spec)
+        self.month = None
+        self.year = None
 
-    date_pattern = re.compile(r'^\d{2}$')
-    amount_pattern = re.compile(r'\d{1,3}(?:,\d{3})*\.\d{2}')
+    def handle(self, line):
+        if self.month is None:
+            self.month, self.year = extract_date_info(line, self.spec.patterns["periodo"])
+        super().handle(line)
 
-    for line in lines:
+    def parse_row(self, line):
         parts = line.split()
-        if len(parts) > 3 and date_pattern.match(parts[0]):
-            movements.append(line.strip())
+        if len(parts) <= 3 or not self.spec.date_pattern.match(parts[0]):
+            return None
+
+        cargos = "0"
+        abonos = "0"
+        description_parts = []
+
+        for part in parts[1:]:
+            if AMOUNT_PATTERN.match(part):
+                if self.spec.withdrawals.search(line) and cargos == "0":
+                    cargos = part
+                elif self.spec.deposits.search(line) and abonos == "0":
+                    abonos = part
+                break
+            else:
+                description_parts.append(part)
+
+        return {
+            "Fecha": parts[0],
+            "Descripción": " ".join(description_parts).strip(),
+            "Cargos": cargos,
+            "Abonos": abonos
+        }
+
+    def close(self):
+        rows = super().close()
+        rows.map_text("Fecha", lambda fecha: f"{fecha}/{self.month}/{self.year}")
+        return rows
+
+def process_banregio_pdf(full_text, spec=None):
+    parser = BanregioParser(spec)
+    movements = parser.parse(iter_lines(full_text))
+
+    if not parser.month or not parser.year:
+        show_warning("Advertencia", "No se pudo encontrar la información del mes y año en el estado de cuenta.")
+        return pd.DataFrame()
 
-    for movement in movements:
-        parts = movement.split()
+    return movements.to_frame()
 
-        if len(parts) > 3:
-            day = parts[0]
-            cargos = "0"
-            abonos = "0"
-            description_parts = []
-
-            for i, part in enumerate(parts[1:], start=1):
-                if amount_pattern.match(part):
-                    if "TRA" in movement and cargos == "0":  
-                        cargos = part
-                    elif "INT" in movement and abonos == "0": 
-                        abonos = part
-                    break
-                else:
-                    description_parts.append(part)
-
-            description = " ".join(description_parts).strip()
-
-            full_date = f"{day}/{month}/{year}"
-
-            movement_info = {
-                "Fecha": full_date,
-                "Descripción": description,
-                "Cargos": cargos,
-                "Abonos": abonos
-            }
-
-            movements_data.append(movement_info)    
-
-    return pd.DataFrame(movements_data)
-
-def process_santander_pdf(full_text):
-    movements_section = extract_movements_section(full_text)
-    saldo_anterior, df_movimientos = extract_and_format_movements_flexible(movements_section)
-    if saldo_anterior is None or df_movimientos.empty:
-        messagebox.showwarning("Advertencia", "No se pudo extraer el saldo inicial o no se encontraron movimientos.")
+def process_santander_pdf(full_text, spec=None):
+    spec = spec or bank_spec("SANTANDER")
+    movements_section = extract_movements_section(full_text, spec)
+    saldo_anterior, movimientos = extract_and_format_movements_flexible(movements_section, spec)
+    if saldo_anterior is None or not movimientos:
+        show_warning("Advertencia", "No se pudo extraer el saldo inicial o no se encontraron movimientos.")
         return pd.DataFrame()
 
-    df_classified = classify_movements(df_movimientos, saldo_anterior)
+    df_classified = classify_movements(movimientos, saldo_anterior, spec.retiro_on_tie)
 
-    df_summary = df_classified[['Fecha', 'Descripción', 'Retiro', 'Depósito']].copy()
+    df_summary = df_classified[['Fecha', 'Descripción', 'Retiro', 'Depósito', RECONCILIATION_COLUMN]].copy()
 
-    return df_summary
+    return with_balances(df_summary, movimientos.column('Saldo'), saldo_anterior)
 
-def process_inbursa_pdf(full_text):
-    lines = full_text.split('\n')
-    movements_data = []
-    balance_inicial = None
-    saldo_anterior = None
+class InbursaParser(SpecParser, SingleLineParser):
+    bank = "INBURSA"
 
-    for line in lines:
-        line = line.strip()
+    def __init__(self, spec=None):
+        super().__init__(spec)
+        self.restarts = {}
 
-        if not line:
-            continue
+    def normalize(self, line):
+        return line.strip()
 
-        if 'BALANCE INICIAL' in line:
-            balance_inicial = float(re.findall(r'\d{1,3}(?:,\d{3})*\.\d{2}', line)[0].replace(',',''))
-            saldo_anterior = balance_inicial
-            continue
+    def skip(self, line):
+        return not line
 
-        if re.match(r'^[A-Z]{3} \d{2}', line):
-            parts = line.split()
+    def parse_row(self, line):
+        if self.spec.markers["saldo_inicial"] in line:
+            self.restarts[len(self.rows)] = find_amounts(line)[0]
+            return None
 
-            if len(parts) < 5:
-                print(f"Línea ignorada por tener menos de 5 partes: {line}")
-                continue
+        if not self.spec.date_pattern.match(line):
+            return None
 
-            try:
-                fecha = " ".join(parts[:2])
-                concepto = " ".join(parts[2:-2])
-                monto = float(parts[-2].replace(',', ''))
-                saldo = float(parts[-1].replace(',', ''))
-
-                if saldo > saldo_anterior:
-                    abonos = monto
-                    cargos = 0.0
-
-                else:
-                    cargos = monto
-                    abonos = 0.0
-
-                movement_info = {
-                    "Fecha": fecha,
-                    "Concepto": concepto,
-                    "Cargos": cargos,
-                    "Abonos": abonos
-                }
-                movements_data.append(movement_info)
-
-                saldo_anterior = saldo
-            except ValueError as e:
-                print(f"Error al procesar la linea: {line}, Error: {e}")
-                continue
-
-    return pd.DataFrame(movements_data)
+        parts = line.split()
+        if len(parts) < 5:
+            print(f"Línea ignorada por tener menos de 5 partes: {line}")
+            self.lines_rejected += 1
+            return None
+
+        try:
+            monto = parse_amount(parts[-2])
+            saldo = parse_amount(parts[-1])
+        except ValueError as e:
+            print(f"Error al procesar la linea: {line}, Error: {e}")
+            self.lines_rejected += 1
+            return None
+
+        return {
+            "Fecha": " ".join(parts[:2]),
+            "Concepto": " ".join(parts[2:-2]),
+            "Monto": monto,
+            "Saldo": saldo
+        }
+
+def process_inbursa_pdf(full_text, spec=None):
+    parser = InbursaParser(spec)
+    movements = parser.parse(iter_lines(full_text))
+
+    if not movements:
+        return pd.DataFrame()
 
-def process_scotiabank_pdf(full_text):
-    saldo_inicial = extract_saldo_inicial(full_text)
+    _, cargos, abonos, descuadre = classify_by_balance(movements.column("Monto"), movements.column("Saldo"), None,
+                                                       retiro_on_tie=parser.spec.retiro_on_tie, restarts=parser.restarts)
+    return pd.DataFrame({
+        "Fecha": movements.column("Fecha"),
+        "Concepto": movements.column("Concepto"),
+        "Cargos": cargos,
+        "Abonos": abonos,
+        RECONCILIATION_COLUMN: descuadre,
+    }).pipe(with_balances, movements.column("Saldo"), parser.restarts.get(0))
+
+def process_scotiabank_pdf(full_text, spec=None):
+    spec = spec or bank_spec("SCOTIABANK")
+    saldo_inicial = extract_saldo_inicial(full_text, spec.patterns["saldo_inicial"])
     if saldo_inicial is None:
-        messagebox.showwarning("Advertencia", "No se pudo extraer el saldo inicial.")
+        show_warning("Advertencia", "No se pudo extraer el saldo inicial.")
         return pd.DataFrame()
     
-    refined_movements = refine_and_capture_movements(full_text)
-    df_classified = classify_movements_with_saldo_initial(refined_movements, saldo_inicial)
+    refined_movements = refine_and_capture_movements(full_text, spec)
+    df_classified = classify_movements_with_saldo_initial(refined_movements, saldo_inicial, spec.retiro_on_tie)
+    if not df_classified.empty:
+        with_balances(df_classified, None, saldo_inicial)
     
-    messagebox.showwarning(
+    show_warning(
         "Revisión Necesaria",
         "Revisar el archivo Excel al final, ya que movimientos que estén muy abajo del archivo PDF no se registraran bien."
     )
 
     return df_classified
 
+BANK_FORMATS = {
+    "banamex": process_banamex_pdf,
+    "bancomer": process_bancomer_pdf,
+    "banorte": process_banorte_pdf,
+    "banregio": process_banregio_pdf,
+    "inbursa": process_inbursa_pdf,
+    "lineas": process_line_pdf,
+    "santander": process_santander_pdf,
+    "scotiabank": process_scotiabank_pdf,
+}
+
+def bank_parsers():
+    parsers = {}
+    for bank, spec in load_registry().items():
+        if spec.format not in BANK_FORMATS:
+            raise ValueError(f"{spec.path}: formato desconocido {spec.format} (use uno de {', '.join(BANK_FORMATS)})")
+        parsers[bank] = partial(BANK_FORMATS[spec.format], spec=spec)
+    return parsers
+
+BANK_PARSERS = bank_parsers()
+
+def parse_statement(full_text, bank):
+    with span("parse"):
+        df_movements = BANK_PARSERS[bank](full_text)
+    count("movements", len(df_movements))
+    return df_movements
+
 def process_pdf():
-    pdf_path = filedialog.askopenfilename(title="Selecciona el archivo PDF", filetypes=[("PDF files", "*.pdf")])
+    global active_runner
+    from tkinter import DISABLED, NORMAL, filedialog, messagebox
+
+    pdf_paths = filedialog.askopenfilenames(title="Selecciona los archivos PDF", filetypes=[("PDF files", "*.pdf")])
     
-    if not pdf_path:
+    if not pdf_paths:
         messagebox.showwarning("Advertencia", "No seleccionaste ningún archivo PDF.")
         return
-    
-    full_text = extract_pdf_text(pdf_path)
-    cleaned_text = clean_text(full_text)
-
-    if selected_bank.get() == "BANAMEX":
-        df_movements = process_banamex_pdf(cleaned_text)
-    elif selected_bank.get() == "BANCOAZTE":
-        df_movements = process_bancoazte_pdf(full_text)
-    elif selected_bank.get() == "BANCOMER":
-        df_movements = process_bancomer_pdf(full_text)
-    elif selected_bank.get() == "BANORTE":
-        df_movements = process_banorte_pdf(full_text)
-    elif selected_bank.get() == "BANREGIO":
-        df_movements = process_banregio_pdf(full_text)
-    elif selected_bank.get() == "INBURSA":
-        df_movements = process_inbursa_pdf(full_text)
-    elif selected_bank.get() == "SANTANDER":
-        df_movements = process_santander_pdf(full_text)
-    elif selected_bank.get() == "SCOTIABANK":
-        df_movements = process_scotiabank_pdf(full_text)
+
+    if len(pdf_paths) == 1:
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("Parquet files", "*.parquet")],
+            title="Guardar archivo como"
+        )
+        if not save_path:
+            return
+        jobs = [(pdf_paths[0], save_path)]
     else:
-        messagebox.showwarning("Advertencia", f"El análisis para {selected_bank.get()} no está implementado.")
-        return
-    
-    save_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")], title="Guardar archivo como")
-    
-    if save_path:
-        df_movements.to_excel(save_path, index=False)
-        messagebox.showinfo("Éxito", f"Archivo exportado a: {save_path}")
+        out_dir = filedialog.askdirectory(title="Selecciona la carpeta donde guardar los Excel")
+        if not out_dir:
+            return
+        from batch import output_path_for
+        jobs = [(pdf_path, output_path_for(pdf_path, out_dir)) for pdf_path in pdf_paths]
+
+    from gui_worker import JobRunner
+    cache_options = (get_text_cache().cache_dir, get_text_cache().max_bytes // (1024 * 1024)) if use_cache else None
+    active_runner = JobRunner(jobs, selected_bank.get(), cache_options=cache_options, profile_dir=profile_dir, profiler=profiler,
+                              ocr_options=ocr_options)
+    active_runner.start()
+    job_results.clear()
+
+    process_button.config(state=DISABLED)
+    cancel_button.config(state=NORMAL)
+    progress_bar.config(value=0, maximum=1)
+    status_text.set(f"Procesando 0/{len(jobs)} archivos...")
+    root.after(POLL_MS, poll_jobs)
+
+def poll_jobs():
+    for result in active_runner.poll():
+        job_results.append(result)
+        if metrics_log and "Métricas" in result:
+            append_metrics(metrics_log, result["Métricas"])
+
+    pages_done, pages_total = active_runner.progress()
+    progress_bar.config(value=pages_done, maximum=max(pages_total, 1))
+    state = "Cancelando" if active_runner.cancelled else "Procesando"
+    status_text.set(f"{state} {len(job_results)}/{len(active_runner.jobs)} archivos, {pages_done}/{pages_total} páginas")
+
+    if active_runner.done:
+        finish_jobs()
+    else:
+        root.after(POLL_MS, poll_jobs)
+
+def cancel_jobs():
+    from tkinter import DISABLED
+    if active_runner is not None and not active_runner.done:
+        active_runner.cancel()
+        cancel_button.config(state=DISABLED)
+
+def finish_jobs():
+    global active_runner
+    from tkinter import DISABLED, NORMAL, messagebox
+
+    runner, active_runner = active_runner, None
+    process_button.config(state=NORMAL)
+    cancel_button.config(state=DISABLED)
+
+    for title, message in runner.warnings:
+        messagebox.showwarning(title, message)
+
+    succeeded = [result for result in job_results if not result["Error"]]
+    failed = [result for result in job_results if result["Error"]]
+    status_text.set(f"Terminado: {len(succeeded)} correctos, {len(failed)} con error.")
+
+    lines = [f"{os.path.basename(r['Archivo'])}: {r['Movimientos']} movimientos -> {r['Salida']}" for r in succeeded]
+    lines += [f"{os.path.basename(r['Archivo'])}: {r['Error']}" for r in failed]
+    if len(job_results) == 1 and succeeded:
+        messagebox.showinfo("Éxito", f"Archivo exportado a: {succeeded[0]['Salida']}")
+    elif failed:
+        messagebox.showwarning("Resultado", "\n".join(lines))
+    else:
+        messagebox.showinfo("Éxito", "\n".join(lines))
+
+def build_gui():
+    global root, selected_bank, process_button, cancel_button, progress_bar, status_text
+    from tkinter import DISABLED, Button, Label, OptionMenu, StringVar, Tk, ttk
+
+    root = Tk()
+    root.title("Extractor de Movimientos Financieros")
+    root.geometry("360x300")
+
+    welcome_label = Label(root, text="Bienvenido a la aplicación", font=("Helvetica", 14))
+    welcome_label.pack(pady=10)
+
+    selected_bank = StringVar(root)
+    selected_bank.set(AUTO_BANK)
+
+    bank_menu = OptionMenu(root, selected_bank, AUTO_BANK, *BANK_PARSERS)
+    bank_menu.pack(pady=10)
 
-root = Tk()
-root.title("Extractor de Movimientos Financieros")
-root.geometry("300x200")
+    process_button = Button(root, text="Seleccionar y procesar PDF", command=process_pdf, font=("Helvetica", 12))
+    process_button.pack(pady=10)
 
-welcome_label = Label(root, text="Bienvenido a la aplicación", font=("Helvetica", 14))
-welcome_label.pack(pady=10)
+    progress_bar = ttk.Progressbar(root, orient="horizontal", length=300, mode="determinate")
+    progress_bar.pack(pady=5)
 
-selected_bank = StringVar(root)
-selected_bank.set("BANAMEX")
+    status_text = StringVar(root)
+    status_label = Label(root, textvariable=status_text)
+    status_label.pack(pady=5)
 
-bank_menu = OptionMenu(root, selected_bank, "BANAMEX","BANCOAZTE", "BANCOMER", "BANORTE", "BANREGIO", "INBURSA", "SANTANDER", "SCOTIABANK")
-bank_menu.pack(pady=10)
+    cancel_button = Button(root, text="Cancelar", command=cancel_jobs, state=DISABLED)
+    cancel_button.pack(pady=5)
 
-process_button = Button(root, text="Seleccionar y procesar PDF", command=process_pdf, font=("Helvetica", 12))
-process_button.pack(pady=20)
+    return root
 
-root.mainloop()
+def ocr_options_from(args):
+    return (args.ocr_dpi, args.ocr_lang, args.ocr_workers) if args.ocr else None
+
+def iso_date(text):
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida: {text} (use AAAA-MM-DD)")
+
+def shared_option_parsers(subcommand=False):
+    def default(value):
+        return argparse.SUPPRESS if subcommand else value
+
+    cache_parser = argparse.ArgumentParser(add_help=False)
+    cache_parser.add_argument("--no-cache", action="store_true", default=default(False), help="No usar la caché de texto extraído")
+    cache_parser.add_argument("--cache-dir", default=default(None), help="Directorio de la caché de texto extraído")
+    cache_parser.add_argument("--cache-max-mb", type=int, default=default(None), help="Tamaño máximo de la caché en MB")
+
+    instrument_parser = argparse.ArgumentParser(add_help=False)
+    instrument_parser.add_argument("--metrics", dest="metrics_log", default=default(None), metavar="ARCHIVO", help="Agregar una línea JSON por archivo con tiempos por etapa y contadores")
+    instrument_parser.add_argument("--profile-dir", default=default(None), help="Guardar un perfil por archivo procesado en este directorio")
+    instrument_parser.add_argument("--profiler", default=default("cprofile"), choices=PROFILERS, help="Perfilador a usar con --profile-dir")
+
+    ocr_parser = argparse.ArgumentParser(add_help=False)
+    ocr_parser.add_argument("--ocr", action="store_true", default=default(False), help="Reconocer con Tesseract las páginas escaneadas que no tienen texto")
+    ocr_parser.add_argument("--ocr-dpi", type=int, default=default(DEFAULT_DPI), help="Resolución con la que se rasterizan las páginas para OCR")
+    ocr_parser.add_argument("--ocr-lang", default=default(DEFAULT_LANG), help="Idioma de Tesseract")
+    ocr_parser.add_argument("--ocr-workers", type=int, default=default(None), help="Procesos de OCR por archivo (por defecto, núcleos repartidos entre los archivos)")
+
+    client_parser = argparse.ArgumentParser(add_help=False)
+    client_parser.add_argument("--cliente", default=default(None), help="Usar solo el filtro de ruido de clientes/<cliente>.toml (por defecto, todos los archivos de clientes)")
+
+    return cache_parser, instrument_parser, client_parser, ocr_parser
+
+def statement_option_parsers():
+    section_banks = [bank for bank, spec in load_registry().items() if spec.section is not None]
+
+    input_parser = argparse.ArgumentParser(add_help=False)
+    input_parser.add_argument("--bank", default=AUTO_BANK, choices=[AUTO_BANK, *BANK_PARSERS], help="Banco de los estados de cuenta (AUTO lo detecta por archivo)")
+    input_parser.add_argument("--in", dest="in_dir", required=True, help="Directorio con los PDF de entrada")
+    input_parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por defecto, núcleos de la máquina)")
+
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument("--out", dest="out_dir", required=True, help="Directorio donde se escriben las salidas")
+    output_parser.add_argument("--format", dest="output_format", default=".xlsx", choices=OUTPUT_FORMATS, help="Formato de los archivos de salida")
+
+    engine_parser = argparse.ArgumentParser(add_help=False)
+    engine_parser.add_argument("--engine", default="text", choices=ENGINES, help=f"Motor de extracción (geometry usa la posición de las columnas; disponible para {', '.join(geometry_layouts())})")
+    engine_parser.add_argument("--section-only", action="store_true", help=f"Extraer solo las páginas y regiones de la sección de movimientos ({', '.join(section_banks)})")
+
+    year_parser = argparse.ArgumentParser(add_help=False)
+    year_parser.add_argument("--year", type=int, default=None, help="Año de las fechas sin año cuando no aparece en el estado de cuenta")
+
+    return input_parser, output_parser, engine_parser, year_parser
+
+def main(argv=None):
+    global use_cache, metrics_log, profile_dir, profiler, ocr_options
+
+    cache_parser, instrument_parser, client_parser, ocr_parser = shared_option_parsers(subcommand=True)
+    input_parser, output_parser, engine_parser, year_parser = statement_option_parsers()
+
+    parser = argparse.ArgumentParser(prog="analyzerV2", description="Extractor de Movimientos Financieros", parents=shared_option_parsers())
+    subparsers = parser.add_subparsers(dest="command")
+
+    batch_parser = subparsers.add_parser("batch", help="Procesa un directorio de estados de cuenta sin interfaz gráfica",
+                                         parents=[input_parser, output_parser, engine_parser, year_parser, cache_parser, instrument_parser, client_parser, ocr_parser])
+    batch_parser.add_argument("--consolidate", default=None, metavar="ARCHIVO", help="Escribir todos los movimientos en un solo archivo (.xlsx, .csv o .parquet) con columnas Banco y Archivo "
+                                                                                "en lugar de un archivo por estado de cuenta en --out")
+    batch_parser.add_argument("--summary", default=None, metavar="ARCHIVO", help="Escribir un resumen de conciliación por archivo (saldo inicial + depósitos - retiros = saldo final)")
+    batch_parser.add_argument("--quality", default=None, metavar="ARCHIVO", help="Escribir la calidad por archivo: movimientos cuya continuidad de saldo (saldo anterior - retiro + depósito = saldo) se verifica en centavos exactos")
+    batch_parser.add_argument("--breaks", default=None, metavar="ARCHIVO", help="Escribir cada fila donde se rompe la continuidad del saldo, con el saldo esperado y la diferencia")
+
+    watch_parser = subparsers.add_parser("watch", help="Vigila un directorio y procesa los PDF nuevos conforme llegan",
+                                         parents=[input_parser, output_parser, engine_parser, cache_parser, instrument_parser, client_parser, ocr_parser])
+    watch_parser.add_argument("--poll", type=float, default=None, help="Segundos entre revisiones del directorio cuando no está instalado watchdog (1 por defecto)")
+    watch_parser.add_argument("--settle", type=float, default=None, help="Segundos sin cambios antes de procesar un archivo que se está copiando (2 por defecto)")
+    watch_parser.add_argument("--max-pending", type=int, default=None, help="Máximo de archivos en proceso a la vez (por defecto, el doble de procesos)")
+    watch_parser.add_argument("--once", action="store_true", help="Procesar los PDF presentes y terminar")
+
+    serve_parser = subparsers.add_parser("serve", help="Servicio HTTP que recibe PDF y devuelve los movimientos normalizados",
+                                         parents=[engine_parser, cache_parser, instrument_parser, client_parser, ocr_parser])
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Dirección en la que escucha el servicio")
+    serve_parser.add_argument("--port", type=int, default=8080, help="Puerto del servicio")
+    serve_parser.add_argument("--concurrency", type=int, default=None, help="Estados de cuenta procesados a la vez (por defecto, núcleos de la máquina)")
+    serve_parser.add_argument("--queue", dest="queue_size", type=int, default=None, help="Solicitudes en espera antes de responder 503 (por defecto, el doble de --concurrency)")
+    serve_parser.add_argument("--max-mb", type=int, default=50, help="Tamaño máximo del PDF recibido en MB")
+
+    ledger_parser = subparsers.add_parser("ledger", help="Libro local de movimientos (SQLite) sin duplicados")
+    ledger_commands = ledger_parser.add_subparsers(dest="ledger_command", required=True)
+
+    ingest_parser = ledger_commands.add_parser("ingest", help="Agrega al libro los PDF que aún no se han ingresado",
+                                               parents=[input_parser, engine_parser, year_parser, cache_parser, client_parser])
+    ingest_parser.add_argument("--db", default=DEFAULT_LEDGER_PATH, help="Archivo SQLite del libro de movimientos")
+    ingest_parser.add_argument("--cuenta", required=True, help="Cuenta a la que pertenecen los estados de cuenta; forma parte de la llave "
+                                                              "que descarta duplicados, así que dos cuentas del mismo banco no deben compartirla")
+
+    export_parser = ledger_commands.add_parser("export", help="Exporta un rango de fechas del libro sin volver a leer los PDF")
+    export_parser.add_argument("--db", default=DEFAULT_LEDGER_PATH, help="Archivo SQLite del libro de movimientos")
+    export_parser.add_argument("--out", dest="out_path", required=True, help="Archivo de salida (.xlsx, .csv o .parquet)")
+    export_parser.add_argument("--desde", default=None, type=iso_date, help="Fecha inicial AAAA-MM-DD")
+    export_parser.add_argument("--hasta", default=None, type=iso_date, help="Fecha final AAAA-MM-DD")
+    export_parser.add_argument("--bank", default=None, choices=list(BANK_PARSERS), help="Exportar solo este banco")
+    export_parser.add_argument("--cuenta", default=None, help="Exportar solo esta cuenta")
+
+    args = parser.parse_args(argv)
+    if getattr(args, "engine", "text") == "geometry" and (args.section_only or getattr(args, "ocr", False)):
+        parser.error("--engine geometry lee la posición de las palabras en todas las páginas; no se combina con --section-only ni con --ocr")
+    if getattr(args, "cliente", None):
+        try:
+            client_keywords(None, args.cliente)
+        except ValueError as e:
+            parser.error(str(e))
+        os.environ["EXTRACTOR_CLIENTE"] = args.cliente
+    if args.profile_dir:
+        os.makedirs(args.profile_dir, exist_ok=True)
+    cache_options = None if args.no_cache else (args.cache_dir, args.cache_max_mb)
+
+    if args.command == "batch":
+        from batch import run_batch
+        failures = run_batch(args.bank, args.in_dir, args.out_dir, workers=args.workers, cache_options=cache_options,
+                             section_only=args.section_only, output_format=args.output_format, consolidate=args.consolidate,
+                             engine=args.engine, metrics_log=args.metrics_log, profile_dir=args.profile_dir, profiler=args.profiler,
+                             summary=args.summary, year=args.year, ocr_options=ocr_options_from(args), quality=args.quality,
+                             breaks=args.breaks)
+        return 1 if failures else 0
+
+    if args.command == "watch":
+        from watch import POLL_SECONDS, SETTLE_SECONDS, run_watch
+        totals = run_watch(args.bank, args.in_dir, args.out_dir, workers=args.workers, output_format=args.output_format,
+                           cache_options=cache_options, section_only=args.section_only, engine=args.engine,
+                           metrics_log=args.metrics_log, ocr_options=ocr_options_from(args), poll_seconds=args.poll or POLL_SECONDS,
+                           settle_seconds=args.settle or SETTLE_SECONDS, max_pending=args.max_pending, once=args.once)
+        return 1 if totals["error"] else 0
+
+    if args.command == "serve":
+        from server import run_server
+        run_server(args.host, args.port, concurrency=args.concurrency, queue_size=args.queue_size, max_mb=args.max_mb,
+                   cache_options=cache_options, section_only=args.section_only, engine=args.engine,
+                   ocr_options=ocr_options_from(args), metrics_log=args.metrics_log)
+        return 0
+
+    if args.command == "ledger":
+        from ledger import run_export, run_ingest
+        if args.ledger_command == "export":
+            run_export(args.out_path, args.db, desde=args.desde, hasta=args.hasta, bank=args.bank, cuenta=args.cuenta)
+            return 0
+        if not args.cuenta.strip():
+            parser.error("--cuenta no puede estar vacía")
+        failures = run_ingest(args.bank, args.in_dir, args.cuenta, args.db, workers=args.workers, cache_options=cache_options,
+                              section_only=args.section_only, engine=args.engine, year=args.year)
+        return 1 if failures else 0
+
+    use_cache = cache_options is not None
+    metrics_log, profile_dir, profiler = args.metrics_log, args.profile_dir, args.profiler
+    ocr_options = ocr_options_from(args)
+    if use_cache:
+        get_text_cache(*cache_options)
+    build_gui().mainloop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import os
+import re
+import glob
+import tomllib
+from functools import lru_cache
+
+from noise import KeywordMatcher
+
+BANKS_DIR = os.environ.get(
+    "EXTRACTOR_BANCOS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "bancos"),
+)
+COLUMN_KINDS = ("text", "cents")
+BALANCE_SIGN_COLUMNS = ("Monto", "Saldo")
+
+def compile_pattern(path, where, pattern, ignore_case=False, multiline=False):
+    flags = (re.IGNORECASE if ignore_case else 0) | (re.MULTILINE if multiline else 0)
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise ValueError(f"{path}: {where} no es una expresión regular válida ({e})")
+
+def compile_fingerprint(path, marker):
+    if "texto" in marker:
+        pattern = re.escape(marker["texto"])
+    elif "regex" in marker:
+        pattern = marker["regex"]
+    else:
+        raise ValueError(f"{path}: cada marcador de [deteccion] necesita texto o regex")
+    compiled = compile_pattern(path, "[deteccion]", pattern, marker.get("ignorar_mayusculas", False), marker.get("multilinea", False))
+    return compiled, marker.get("peso", 1)
+
+def text_list(path, where, values):
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise ValueError(f"{path}: {where} debe ser una lista de textos")
+    return values
+
+def token_slice(path, name, position):
+    if not isinstance(position, list) or not all(isinstance(i, int) for i in position) or len(position) not in (1, 2):
+        raise ValueError(f"{path}: [lineas.posiciones].{name} debe ser [i] o [inicio, fin]")
+    if len(position) == 1:
+        return slice(position[0], position[0] + 1 or None)
+    return slice(*position)
+
+def geometry_layout(config, date_pattern, stop):
+    return {
+        "date_pattern": date_pattern,
+        "date_words": config["palabras_fecha"],
+        "fecha_words": config.get("palabras_en_fecha", config["palabras_fecha"]),
+        "fecha_column": config["columna_fecha"],
+        "concepto_column": config["columna_concepto"],
+        "columns": {name: tuple(headers) for name, headers in config["encabezados"].items()},
+        "retiro_column": config["columna_retiro"],
+        "deposito_column": config["columna_deposito"],
+        "stop": stop,
+    }
+
+class BankSpec:
+    def __init__(self, path, config):
+        self.path = path
+        self.name = config["nombre"]
+        self.format = config["formato"]
+        self.fingerprints = [compile_fingerprint(path, marker) for marker in config.get("deteccion", {}).get("marcadores", [])]
+
+        section = config.get("seccion")
+        self.section = (section["inicio"], section["fin"]) if section else None
+        self.section_required = bool(section and section.get("requerida", False))
+
+        fechas = config.get("fechas", {})
+        self.date_pattern = compile_pattern(path, "[fechas].patron", fechas["patron"]) if "patron" in fechas else None
+        self.patterns = {name: compile_pattern(path, f"[patrones].{name}", pattern) for name, pattern in config.get("patrones", {}).items()}
+        self.markers = dict(config.get("marcas", {}))
+
+        self.columns = dict(config["columnas"]) if "columnas" in config else None
+        for name, kind in (self.columns or {}).items():
+            if kind not in COLUMN_KINDS:
+                raise ValueError(f"{path}: [columnas].{name} debe ser uno de {', '.join(COLUMN_KINDS)}")
+
+        lineas = config.get("lineas", {})
+        self.min_words = lineas.get("minimo_palabras", 1)
+        self.positions = {name: token_slice(path, name, position) for name, position in lineas.get("posiciones", {}).items()}
+        if self.positions and set(self.positions) != set(self.columns or {}):
+            raise ValueError(f"{path}: [lineas.posiciones] debe tener las mismas columnas que [columnas]")
+
+        signos = config.get("signos", {})
+        self.retiro_on_tie = signos.get("retiro_en_empate", False)
+        self.balance_signs = signos.get("por_saldo", False)
+        if self.balance_signs and any((self.columns or {}).get(name) != "cents" for name in BALANCE_SIGN_COLUMNS):
+            raise ValueError(f"{path}: [signos].por_saldo necesita las columnas {' y '.join(BALANCE_SIGN_COLUMNS)} de tipo cents en [columnas]")
+
+        palabras = config.get("palabras", {})
+        self.deposits = KeywordMatcher(text_list(path, "[palabras].depositos", palabras.get("depositos", [])))
+        self.withdrawals = KeywordMatcher(text_list(path, "[palabras].retiros", palabras.get("retiros", [])))
+        self.noise_keywords = text_list(path, "[ruido].palabras", config.get("ruido", {}).get("palabras", []))
+
+        geometria = config.get("geometria")
+        if geometria is not None and self.date_pattern is None:
+            raise ValueError(f"{path}: [geometria] necesita [fechas].patron")
+        self.geometry = geometry_layout(geometria, self.date_pattern, self.markers.get("fin")) if geometria else None
+
+def spec_paths(banks_dir=None):
+    return sorted(glob.glob(os.path.join(banks_dir or BANKS_DIR, "*.toml")))
+
+def load_spec(path):
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+    try:
+        return BankSpec(path, config)
+    except KeyError as e:
+        raise ValueError(f"{path}: falta la clave {e.args[0]}")
+
+@lru_cache(maxsize=None)
+def load_registry(banks_dir=None):
+    specs = {}
+    for path in spec_paths(banks_dir):
+        spec = load_spec(path)
+        if spec.name in specs:
+            raise ValueError(f"{path}: el banco {spec.name} ya está definido en {specs[spec.name].path}")
+        specs[spec.name] = spec
+    if not specs:
+        raise ValueError(f"No hay especificaciones de bancos en {banks_dir or BANKS_DIR}")
+    return dict(sorted(specs.items()))
+
+def bank_spec(bank):
+    try:
+        return load_registry()[bank]
+    except KeyError:
+        raise ValueError(f"Banco desconocido: {bank}")
+
+def bank_names():
+    return list(load_registry())
@@ -0,0 +1,220 @@
+import os
+import csv
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lazy import HEAVY_MODULES, lazy_import, preload
+pd = lazy_import("pandas")
+
+from analyzerV2 import extract_pdf_pages, parse_statement, section_for, uses_geometry
+from geometry import parse_statement_geometry
+from text_cache import file_sha256, get_text_cache
+from detect import AUTO_BANK, DETECTION_PAGES, detect_bank, detect_bank_from_pages, detect_bank_from_texts
+from extraction import join_page_texts
+from ocr import ocr_cache_for, ocr_missing_pages, with_ocr_workers
+from writers import open_writer, write_movements
+from classify import OPENING_BALANCE_COLUMN
+from schema import NORMALIZED_COLUMNS, NORMALIZED_TYPES, SUMMARY_COLUMNS, SUMMARY_TYPES, export_frame, needs_year, normalize_movements, reconciliation_summary, statement_year
+from validation import BREAK_COLUMNS, BREAK_TYPES, QUALITY_COLUMNS, QUALITY_TYPES, balance_continuity
+from metrics import Metrics, append_metrics, collecting, profile_path_for, profiled, span
+
+FAILURE_REPORT_NAME = "errores.csv"
+CHECK_COLUMNS = ["Banco", "Archivo", "Fecha", "Fecha Original", "Concepto", "Retiro", "Depósito", "Saldo", OPENING_BALANCE_COLUMN]
+
+def list_pdfs(in_dir):
+    return sorted(
+        os.path.join(in_dir, name)
+        for name in os.listdir(in_dir)
+        if name.lower().endswith(".pdf")
+    )
+
+def output_path_for(pdf_path, out_dir, extension=".xlsx"):
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(out_dir, stem + extension)
+
+def detect_statement_bank(pdf_path, cache=None, ocr_options=None, file_digest=None):
+    first_pages = cache.cached_detection_texts(pdf_path, DETECTION_PAGES, file_digest) if cache is not None else None
+    bank = detect_bank_from_texts(first_pages) if first_pages else None
+    if bank is None:
+        bank, detected_pages = detect_bank_from_pages(pdf_path)
+        if bank is not None and cache is not None:
+            cache.put_detection_texts(pdf_path, DETECTION_PAGES, detected_pages, file_digest)
+        first_pages = first_pages or detected_pages
+    if bank is None and ocr_options is not None:
+        page_texts = first_pages[:DETECTION_PAGES]
+        bank = detect_bank(join_page_texts(ocr_missing_pages(pdf_path, page_texts, *ocr_options, cache=ocr_cache_for(cache))))
+    if bank is None:
+        raise ValueError("No se pudo detectar el banco del estado de cuenta.")
+    return bank, first_pages
+
+def process_statement(pdf_path, bank, cache=None, section_only=False, engine="text", workers=1, ocr_options=None, file_digest=None):
+    if cache is not None and file_digest is None:
+        file_digest = file_sha256(pdf_path)
+    first_pages = None
+    if bank == AUTO_BANK:
+        with span("detect"):
+            bank, first_pages = detect_statement_bank(pdf_path, cache, ocr_options, file_digest)
+
+    if uses_geometry(bank, engine):
+        df_movements = parse_statement_geometry(pdf_path, bank, cache=cache, file_digest=file_digest)
+    else:
+        section = section_for(bank, section_only)
+        page_texts = extract_pdf_pages(pdf_path, workers=workers, cache=cache, section=section, ocr_options=ocr_options,
+                                       first_pages=first_pages, file_digest=file_digest)
+        if section is None:
+            first_pages = page_texts
+        df_movements = parse_statement(join_page_texts(page_texts), bank)
+
+    if df_movements.empty:
+        raise ValueError("No se encontraron movimientos.")
+
+    return bank, df_movements, first_pages
+
+def run_statement(pdf_path, bank, out_dir=None, output_format=".xlsx", cache_options=None, section_only=False, engine="text",
+                  profile_dir=None, profiler="cprofile", normalized=False, year=None, ocr_options=None, file_digest=None):
+    cache = get_text_cache(*cache_options) if cache_options is not None else None
+    lookups_before = (cache.hits, cache.misses) if cache else None
+    result = {"Archivo": pdf_path, "Banco": bank, "Salida": None, "Movimientos": 0, "Error": None}
+    metrics = Metrics(archivo=os.path.basename(pdf_path), banco=bank, engine=engine)
+    profile_path = profile_path_for(pdf_path, profile_dir, profiler) if profile_dir else None
+    try:
+        with collecting(metrics), profiled(profile_path, profiler):
+            result["Banco"], df_movements, first_pages = process_statement(pdf_path, bank, cache=cache, section_only=section_only, engine=engine,
+                                                                      ocr_options=ocr_options, file_digest=file_digest)
+            result["Movimientos"] = len(df_movements)
+            if normalized:
+                with span("normalize"):
+                    statement_year_hint = (statement_year(pdf_path, first_pages) or year) if needs_year(df_movements) else None
+                    result["Normalizado"] = normalize_movements(df_movements, result["Banco"], os.path.basename(pdf_path), statement_year_hint)
+            if out_dir is not None:
+                with span("export"):
+                    result["Salida"] = write_movements(df_movements, output_path_for(pdf_path, out_dir, output_format))
+    except Exception as e:
+        result["Error"] = f"{type(e).__name__}: {e}"
+        result["Detalle"] = traceback.format_exc()
+    metrics.labels.update(banco=result["Banco"], error=result["Error"])
+    result["Métricas"] = metrics.stop()
+    if cache and (cache.hits, cache.misses) != lookups_before:
+        result["Cache"] = "hit" if cache.hits > lookups_before[0] else "miss"
+    return result
+
+def write_failure_report(failures, out_dir):
+    report_path = os.path.join(out_dir, FAILURE_REPORT_NAME)
+    with open(report_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Archivo", "Banco", "Error", "Detalle"], extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(failures)
+    return report_path
+
+def write_summary(frames, path):
+    df_summary = reconciliation_summary(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=NORMALIZED_COLUMNS))
+    with open_writer(path, SUMMARY_COLUMNS, SUMMARY_TYPES) as writer:
+        writer.write_frame(export_frame(df_summary, SUMMARY_COLUMNS))
+    estados = df_summary["Estado"].value_counts()
+    print(f"Conciliación: {estados.get('cuadra', 0)} cuadran, {estados.get('descuadre', 0)} con descuadre, "
+          f"{estados.get('sin saldo', 0)} sin saldo. Resumen: {path}")
+    return df_summary
+
+def write_quality(frames, path=None, breaks_path=None):
+    df_quality, df_breaks = balance_continuity(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=CHECK_COLUMNS))
+    for out_path, df, columns, types in ((path, df_quality, QUALITY_COLUMNS, QUALITY_TYPES), (breaks_path, df_breaks, BREAK_COLUMNS, BREAK_TYPES)):
+        if out_path:
+            with open_writer(out_path, columns, types) as writer:
+                writer.write_frame(export_frame(df, columns))
+    unchecked = int((df_quality["Verificados"] == 0).sum()) if len(df_quality) else 0
+    broken = int((df_quality["Cortes"] > 0).sum()) if len(df_quality) else 0
+    average = sum(df_quality["Calidad"]) / len(df_quality) if len(df_quality) else 0
+    print(f"Continuidad de saldos: {len(df_quality) - broken - unchecked} archivos sin cortes, {broken} con cortes, "
+          f"{unchecked} sin saldos para verificar; calidad media {average:.1f} %.")
+    if path:
+        print(f"Calidad por archivo: {path}")
+    if breaks_path:
+        print(f"Cortes: {len(df_breaks)} filas en {breaks_path}")
+    return df_quality, df_breaks
+
+def run_batch(bank, in_dir, out_dir, workers=None, cache_options=None, section_only=False,
+              output_format=".xlsx", consolidate=None, engine="text", metrics_log=None, profile_dir=None, profiler="cprofile",
+              summary=None, year=None, ocr_options=None, quality=None, breaks=None):
+    pdf_paths = list_pdfs(in_dir)
+    if not pdf_paths:
+        print(f"No se encontraron archivos PDF en {in_dir}", file=sys.stderr)
+        return []
+
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    ocr_options = with_ocr_workers(ocr_options, workers)
+    total = len(pdf_paths)
+    failures = []
+    cache_counts = {"hit": 0, "miss": 0}
+    start = time.perf_counter()
+
+    options = {
+        "bank": bank,
+        "out_dir": None if consolidate else out_dir,
+        "output_format": output_format,
+        "cache_options": cache_options,
+        "section_only": section_only,
+        "engine": engine,
+        "profile_dir": profile_dir,
+        "profiler": profiler,
+        "normalized": bool(consolidate or summary or quality or breaks),
+        "year": year,
+        "ocr_options": ocr_options,
+    }
+    consolidated_writer = open_writer(consolidate, NORMALIZED_COLUMNS, NORMALIZED_TYPES) if consolidate else None
+    check_frames = []
+
+    print(f"Procesando {total} archivos de {bank} con {workers} procesos...")
+    preload(*HEAVY_MODULES)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_statement, pdf_path, **options) for pdf_path in pdf_paths]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                metrics = result.pop("Métricas")
+                if "Cache" in result:
+                    cache_counts[result["Cache"]] += 1
+                name = os.path.basename(result["Archivo"])
+                if result["Error"]:
+                    failures.append(result)
+                    print(f"[{done}/{total}] ERROR {name}: {result['Error']}")
+                else:
+                    df_normalized = result.pop("Normalizado", None)
+                    if summary or quality or breaks:
+                        check_frames.append(df_normalized[CHECK_COLUMNS])
+                    if consolidated_writer is not None:
+                        with metrics.span("export"):
+                            consolidated_writer.write_frame(export_frame(df_normalized))
+                if metrics_log:
+                    append_metrics(metrics_log, metrics.to_record())
+                if result["Error"]:
+                    continue
+                print(f"[{done}/{total}] {name} ({result['Banco']}): {result['Movimientos']} movimientos")
+    finally:
+        if consolidated_writer is not None:
+            consolidated_writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Terminado en {elapsed:.1f} s: {total - len(failures)} correctos, {len(failures)} con error.")
+    if cache_options is not None:
+        print(f"Caché de texto: {cache_counts['hit']} aciertos, {cache_counts['miss']} fallos.")
+
+    if consolidate:
+        print(f"Consolidado: {consolidated_writer.rows_written} movimientos en {consolidate}")
+
+    if summary:
+        write_summary(check_frames, summary)
+
+    if quality or breaks:
+        write_quality(check_frames, quality, breaks)
+
+    if metrics_log:
+        print(f"Métricas: {metrics_log} (resumen: python metrics.py {metrics_log})")
+
+    if failures:
+        report_path = write_failure_report(failures, out_dir)
+        print(f"Reporte de errores: {report_path}")
+
+    return failures
@@ -0,0 +1,52 @@
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from patterns import find_amounts
+
+CONCEPTS = ["SPEI RECIBIDO", "PAGO A PROVEEDOR", "COMISION", "DEPOSITO EFECTIVO", "TRASPASO REF 123", "COMPRA TPV"]
+
+def synthetic_lines(n_lines, seed=0):
+    rnd = random.Random(seed)
+    lines = []
+    for _ in range(n_lines):
+        n_amounts = rnd.choice([0, 1, 2, 2, 3])
+        amounts = " ".join(f"{rnd.randint(1, 10_000_000) / 100:,.2f}" for _ in range(n_amounts))
+        lines.append(f"{rnd.randint(1, 28):02d} ENE {rnd.choice(CONCEPTS)} {amounts}")
+    return lines
+
+def legacy_amounts(line):
+    if re.search(r'\d{1,3}(?:,\d{3})*\.\d{2}', line):
+        numbers = re.findall(r'\d{1,3}(?:,\d{3})*\.\d{2}', line)
+        return [float(number.replace('$', '').replace(',', '')) for number in numbers]
+    return []
+
+def measure(function, lines):
+    start = time.perf_counter()
+    for line in lines:
+        function(line)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark del tokenizador de montos")
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    lines = synthetic_lines(args.lines)
+    for line in lines[:1000]:
+        assert [cents / 100 for cents in find_amounts(line)] == legacy_amounts(line), line
+
+    legacy = measure(legacy_amounts, lines)
+    shared = measure(find_amounts, lines)
+    print(f"{'método':<22}{'segundos':>10}{'líneas/s':>14}")
+    print(f"{'re.search+findall':<22}{legacy:>10.2f}{args.lines / legacy:>14,.0f}")
+    print(f"{'find_amounts':<22}{shared:>10.2f}{args.lines / shared:>14,.0f}")
+    print(f"Mejora: {legacy / shared:.2f}x")
+
+if __name__ == "__main__":
+    main()
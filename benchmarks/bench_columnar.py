@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columnar import MovementColumns
+from synthetic_statements import BANAMEX_CONCEPTS
+
+MONTHS = ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
+COLUMNS = {"Fecha": "text", "Concepto": "text", "Retiro": "cents", "Depósito": "cents", "Saldo": "cents"}
+
+def iter_rows(n_rows, seed=0):
+    rnd = random.Random(seed)
+    saldo = 10_000_000
+    for _ in range(n_rows):
+        cents = rnd.randint(100, 5_000_000)
+        retiro = rnd.random() < 0.5 and saldo >= cents
+        saldo += -cents if retiro else cents
+        yield {
+            "Fecha": " ".join([f"{rnd.randint(1, 28):02d}", rnd.choice(MONTHS)]),
+            "Concepto": " ".join(rnd.choice(BANAMEX_CONCEPTS)[0].split()),
+            "Retiro": cents if retiro else 0,
+            "Depósito": 0 if retiro else cents,
+            "Saldo": saldo,
+        }
+
+def dict_rows(n_rows):
+    rows = []
+    for row in iter_rows(n_rows):
+        rows.append(row)
+    return rows, lambda: pd.DataFrame(rows)
+
+def columnar_rows(n_rows):
+    rows = MovementColumns(COLUMNS)
+    for row in iter_rows(n_rows):
+        rows.append(row)
+    return rows, rows.to_frame
+
+def columnar_arrow(n_rows):
+    rows, _ = columnar_rows(n_rows)
+    return rows, rows.to_arrow
+
+APPROACHES = {
+    "lista de dict": dict_rows,
+    "columnar": columnar_rows,
+    "columnar→arrow": columnar_arrow,
+}
+
+def measure(build, n_rows):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        rows, convert = build(n_rows)
+        accumulated = time.perf_counter() - start
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = convert()
+        converted = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del rows, result
+    return accumulated, converted, retained / (1024 * 1024), peak / (1024 * 1024)
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria de la lista de dict frente al acumulador columnar de movimientos")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'filas':>10}  {'método':<16}{'acumular s':>11}{'convertir s':>12}{'retenido MB':>13}{'pico conv. MB':>15}")
+    for n_rows in args.rows:
+        for name, build in APPROACHES.items():
+            accumulated, converted, retained, peak = measure(build, n_rows)
+            print(f"{n_rows:>10}  {name:<16}{accumulated:>11.2f}{converted:>12.2f}{retained:>13.1f}{peak:>15.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from detect import detect_bank_from_pdf
+from synthetic_pdf import write_pdf
+from synthetic_statements import STATEMENT_GENERATORS
+
+def iter_corpus(corpus_dir):
+    for bank in sorted(os.listdir(corpus_dir)):
+        bank_dir = os.path.join(corpus_dir, bank)
+        if not os.path.isdir(bank_dir):
+            continue
+        for name in sorted(os.listdir(bank_dir)):
+            if name.lower().endswith(".pdf"):
+                yield bank.upper(), os.path.join(bank_dir, name)
+
+def synthetic_corpus(corpus_dir, files_per_bank, n_pages):
+    for bank, generate in STATEMENT_GENERATORS.items():
+        bank_dir = os.path.join(corpus_dir, bank)
+        os.makedirs(bank_dir)
+        for seed in range(files_per_bank):
+            pages, _ = generate(n_pages, seed=seed)
+            write_pdf(os.path.join(bank_dir, f"{bank.lower()}_{seed:03d}.pdf"), pages)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def report(corpus_dir):
+    latencies = []
+    per_bank = {}
+    misses = []
+    for expected, pdf_path in iter_corpus(corpus_dir):
+        start = time.perf_counter()
+        detected = detect_bank_from_pdf(pdf_path)
+        latencies.append(time.perf_counter() - start)
+
+        correct, total = per_bank.get(expected, (0, 0))
+        per_bank[expected] = (correct + (detected == expected), total + 1)
+        if detected != expected:
+            misses.append((pdf_path, expected, detected))
+
+    if not latencies:
+        print(f"No se encontraron PDFs en {corpus_dir}")
+        return
+
+    print(f"{'banco':<12}{'correctos':>10}{'total':>7}{'exactitud':>11}")
+    for bank, (correct, total) in sorted(per_bank.items()):
+        print(f"{bank:<12}{correct:>10}{total:>7}{correct / total:>11.1%}")
+
+    correct = sum(c for c, _ in per_bank.values())
+    print(f"Exactitud global: {correct}/{len(latencies)} ({correct / len(latencies):.1%})")
+    print(f"Latencia: media {sum(latencies) / len(latencies) * 1000:.1f} ms, "
+          f"p50 {percentile(latencies, 0.5) * 1000:.1f} ms, p95 {percentile(latencies, 0.95) * 1000:.1f} ms")
+    for pdf_path, expected, detected in misses:
+        print(f"  fallo: {pdf_path}: esperado {expected}, detectado {detected}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia y exactitud de la detección automática de banco")
+    parser.add_argument("corpus", nargs="?", help="Directorio con un subdirectorio por banco (BANORTE/, SANTANDER/, ...) con PDFs "
+                                                    "(por defecto, estados de cuenta sintéticos de todos los bancos)")
+    parser.add_argument("--files", type=int, default=3, help="Estados sintéticos por banco")
+    parser.add_argument("--pages", type=int, default=2, help="Páginas por estado sintético")
+    args = parser.parse_args()
+
+    if args.corpus is None:
+        with tempfile.TemporaryDirectory() as tmp:
+            synthetic_corpus(tmp, args.files, args.pages)
+            report(tmp)
+    else:
+        report(args.corpus)
+
+if __name__ == "__main__":
+    main()
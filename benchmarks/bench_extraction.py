@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_pdf import write_pdf
+from synthetic_statements import banorte_statement
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def extract_legacy(pdf_path):
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        full_text = ""
+        for page in pdf.pages:
+            full_text += page.extract_text()
+    return full_text
+
+def extract_streaming(pdf_path, workers):
+    from analyzerV2 import extract_pdf_text
+    return extract_pdf_text(pdf_path, workers=workers)
+
+def peak_rss_mb():
+    if resource is None:
+        return None, None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children
+
+def run_mode(mode, pdf_path, workers):
+    start = time.perf_counter()
+    if mode == "legacy":
+        text = extract_legacy(pdf_path)
+    else:
+        text = extract_streaming(pdf_path, workers)
+    elapsed = time.perf_counter() - start
+    own, children = peak_rss_mb()
+    print(json.dumps({"mode": mode, "workers": workers, "seconds": elapsed, "chars": len(text),
+                      "peak_rss_mb": own, "peak_rss_children_mb": children}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de extracción de texto por páginas")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--run", nargs=3, metavar=("MODE", "PDF", "WORKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        mode, pdf_path, workers = args.run
+        run_mode(mode, pdf_path, int(workers))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "estado_sintetico.pdf")
+        write_pdf(pdf_path, banorte_statement(args.pages)[0])
+        print(f"PDF sintético: {args.pages} páginas, {os.path.getsize(pdf_path) / 1024:.0f} KB")
+
+        runs = [("legacy", 1), ("streaming", 1)]
+        if args.workers > 1:
+            runs.append(("streaming", args.workers))
+
+        print(f"{'modo':<12}{'procesos':>9}{'segundos':>10}{'RSS pico MB':>13}{'RSS hijos MB':>14}")
+        for mode, workers in runs:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", mode, pdf_path, str(workers)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            own = result["peak_rss_mb"]
+            children = result["peak_rss_children_mb"]
+            print(f"{mode:<12}{workers:>9}{result['seconds']:>10.2f}"
+                  f"{own if own is None else round(own, 1)!s:>13}{children if children is None else round(children, 1)!s:>14}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_pdf import write_pdf
+from synthetic_statements import STATEMENT_GENERATORS
+from analyzerV2 import extract_pdf_text, parse_statement
+from geometry import geometry_layouts, parse_statement_geometry
+from schema import normalize_movements
+
+def run_text(pdf_path, bank):
+    with contextlib.redirect_stderr(open(os.devnull, "w")):
+        return parse_statement(extract_pdf_text(pdf_path), bank)
+
+def run_geometry(pdf_path, bank):
+    return parse_statement_geometry(pdf_path, bank)
+
+ENGINES = {"texto": run_text, "geometría": run_geometry}
+
+def row_keys(df, bank):
+    if df.empty:
+        return Counter()
+    df = normalize_movements(df, bank, "")
+    return Counter(zip(df["Fecha Original"], df["Retiro"].fillna(0).astype(int), df["Depósito"].fillna(0).astype(int)))
+
+def accuracy(df, bank, expected):
+    expected_keys = Counter((row["Fecha"], row["Retiro"], row["Depósito"]) for row in expected)
+    found = row_keys(df, bank)
+    correct = sum((expected_keys & found).values())
+    extra = sum((found - expected_keys).values())
+    return correct, extra
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendimiento y exactitud del motor por geometría contra el de texto")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--banks", nargs="+", default=list(geometry_layouts()), choices=list(geometry_layouts()))
+    args = parser.parse_args()
+
+    print(f"{'banco':<12}{'motor':<11}{'segundos':>9}{'págs/s':>9}{'correctos':>11}{'esperados':>11}{'sobrantes':>11}{'exactitud':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for bank in args.banks:
+            pages, expected = STATEMENT_GENERATORS[bank](args.pages)
+            pdf_path = write_pdf(os.path.join(tmp, f"{bank.lower()}.pdf"), pages)
+            for engine, run in ENGINES.items():
+                start = time.perf_counter()
+                df = run(pdf_path, bank)
+                elapsed = time.perf_counter() - start
+                correct, extra = accuracy(df, bank, expected)
+                print(f"{bank:<12}{engine:<11}{elapsed:>9.2f}{len(pages) / elapsed:>9.1f}"
+                      f"{correct:>11}{len(expected):>11}{extra:>11}{correct / len(expected):>11.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import os
+import re
+import sys
+import time
+import random
+import string
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banks import bank_spec
+from noise import KeywordMatcher
+from synthetic_statements import STATEMENT_GENERATORS
+
+def statement_lines(pages):
+    statement_pages, _ = STATEMENT_GENERATORS["BANAMEX"](pages, seed=0)
+    return [line if isinstance(line, str) else " ".join(text for _, text in line) for page in statement_pages for line in page]
+
+def random_keywords(n, seed=0):
+    rng = random.Random(seed)
+    alphabet = string.ascii_uppercase + "  .:"
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(8, 32))).strip() or "X" for _ in range(n)]
+
+def filter_any(keywords, lines):
+    return [line for line in lines if not any(keyword in line for keyword in keywords)]
+
+def filter_alternation(keywords, lines):
+    search = re.compile("|".join(re.escape(keyword) for keyword in keywords)).search
+    return [line for line in lines if search(line) is None]
+
+def filter_trie(keywords, lines):
+    return list(KeywordMatcher(keywords).filter_lines(lines))
+
+METHODS = {
+    "any()": filter_any,
+    "alternación": filter_alternation,
+    "trie": filter_trie,
+}
+
+def best_time(function, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo del filtro de ruido según el número de palabras clave")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--keywords", type=int, nargs="+", default=[5, 50, 500, 5000])
+    args = parser.parse_args()
+
+    lines = statement_lines(args.pages)
+    print(f"{len(lines)} líneas de un estado BANAMEX sintético de {args.pages} páginas")
+    print(f"{'palabras':>9}" + "".join(f"{name:>14}" for name in METHODS) + f"{'líneas/s trie':>16}")
+    bank_keywords = bank_spec("BANAMEX").noise_keywords
+    for n in args.keywords:
+        keywords = bank_keywords + random_keywords(max(0, n - len(bank_keywords)))
+        timings = {}
+        outputs = {}
+        for name, function in METHODS.items():
+            timings[name], outputs[name] = best_time(function, keywords, lines)
+        if len({tuple(output) for output in outputs.values()}) != 1:
+            raise SystemExit(f"Los métodos no coinciden con {n} palabras clave")
+        print(f"{n:>9}" + "".join(f"{timings[name]:>13.4f}s" for name in METHODS) + f"{len(lines) / timings['trie']:>16.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+import pdfplumber
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import process_statement
+from extraction import count_pages
+from ocr import DEFAULT_LANG, ocr_page, require_tesseract, scanned_pages
+from synthetic_pdf import write_pdf
+from synthetic_statements import STATEMENT_GENERATORS
+
+def write_scanned_pdf(src_path, dst_path, dpi):
+    with pdfplumber.open(src_path) as pdf:
+        images = [page.to_image(resolution=dpi).original.convert("L") for page in pdf.pages]
+    images[0].save(dst_path, save_all=True, append_images=images[1:], resolution=dpi)
+    return dst_path
+
+def rasterize(pdf_path, dpi):
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            page.to_image(resolution=dpi).original.convert("L")
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendimiento de lotes mixtos de estados digitales y escaneados con OCR")
+    parser.add_argument("--bank", default="INBURSA", choices=list(STATEMENT_GENERATORS))
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--files", type=int, default=4, help="Archivos digitales y escaneados en el lote mixto (de cada tipo)")
+    parser.add_argument("--dpis", type=int, nargs="+", default=[150, 200, 300])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    try:
+        require_tesseract()
+        has_tesseract = True
+    except RuntimeError as e:
+        print(f"OCR no disponible ({e}); se mide solo la detección y la rasterización.")
+        has_tesseract = False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages, _ = STATEMENT_GENERATORS[args.bank](args.pages)
+        digital = write_pdf(os.path.join(tmp, "digital.pdf"), pages)
+        scanned = write_scanned_pdf(digital, os.path.join(tmp, "escaneado.pdf"), 300)
+        n_pages = count_pages(digital)
+
+        elapsed, candidates = timed(scanned_pages, scanned, [""] * n_pages, 200, DEFAULT_LANG)
+        print(f"detección de páginas sin texto: {len(candidates)}/{n_pages} páginas en {elapsed:.3f} s")
+
+        print(f"{'dpi':>5}{'raster págs/s':>15}{'ocr págs/s':>12}")
+        for dpi in args.dpis:
+            raster, _ = timed(rasterize, scanned, dpi)
+            ocr_rate = "-"
+            if has_tesseract:
+                ocr_seconds, _ = timed(lambda: [ocr_page(scanned, i, dpi) for i in range(n_pages)])
+                ocr_rate = f"{n_pages / ocr_seconds:.2f}"
+            print(f"{dpi:>5}{n_pages / raster:>15.1f}{ocr_rate:>12}")
+
+        if not has_tesseract:
+            return
+
+        batch = [digital] * args.files + [scanned] * args.files
+        total_pages = n_pages * len(batch)
+        print(f"lote mixto: {args.files} digitales + {args.files} escaneados, {total_pages} páginas, sin caché")
+        print(f"{'procesos OCR':>13}{'segundos':>10}{'págs/s':>10}")
+        for workers in args.workers:
+            with contextlib.redirect_stdout(open(os.devnull, "w")), contextlib.redirect_stderr(open(os.devnull, "w")):
+                elapsed, _ = timed(lambda: [process_statement(path, args.bank, ocr_options=(200, DEFAULT_LANG, workers)) for path in batch])
+            print(f"{workers:>13}{elapsed:>10.2f}{total_pages / elapsed:>10.2f}")
+
+if __name__ == "__main__":
+    main()
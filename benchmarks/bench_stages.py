@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzerV2 import clean_text, extract_pdf_text, parse_statement, section_for
+from synthetic_pdf import write_pdf
+from synthetic_statements import STATEMENT_GENERATORS
+from writers import write_movements
+from metrics import Metrics, collecting
+
+STAGES = ["extract", "clean", "parse", "classify", "export"]
+
+def run_stages(pdf_path, bank, out_path, measure):
+    results = {}
+    with measure(results, "extract"):
+        full_text = extract_pdf_text(pdf_path, section=section_for(bank))
+    with measure(results, "clean"):
+        clean_text(full_text)
+    with collecting(Metrics()) as metrics, measure(results, "parse"), contextlib.redirect_stderr(open(os.devnull, "w")):
+        df = parse_statement(full_text, bank)
+    with measure(results, "export"):
+        write_movements(df, out_path)
+    return results, metrics.spans.get("classify", 0.0), len(df)
+
+@contextlib.contextmanager
+def wall_time(results, stage):
+    start = time.perf_counter()
+    yield
+    results[stage] = time.perf_counter() - start
+
+@contextlib.contextmanager
+def peak_memory(results, stage):
+    tracemalloc.reset_peak()
+    yield
+    results[stage] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+def rate(count, elapsed):
+    return f"{count / elapsed:.0f}" if elapsed > 0 else "-"
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo y memoria por etapa (extract, clean, parse, classify, export) por banco")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--banks", nargs="+", default=list(STATEMENT_GENERATORS), choices=list(STATEMENT_GENERATORS))
+    parser.add_argument("--format", dest="output_format", default=".xlsx", choices=[".xlsx", ".csv", ".parquet"])
+    args = parser.parse_args()
+
+    print(f"{'banco':<12}{'etapa':<10}{'segundos':>10}{'págs/s':>10}{'movs/s':>12}{'pico MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for bank in args.banks:
+            pages, _ = STATEMENT_GENERATORS[bank](args.pages)
+            pdf_path = write_pdf(os.path.join(tmp, f"{bank.lower()}.pdf"), pages)
+            out_path = os.path.join(tmp, bank.lower() + args.output_format)
+
+            seconds, classify_seconds, n_movements = run_stages(pdf_path, bank, out_path, wall_time)
+            seconds["parse"] -= classify_seconds
+            seconds["classify"] = classify_seconds
+
+            tracemalloc.start()
+            try:
+                memory, _, _ = run_stages(pdf_path, bank, out_path, peak_memory)
+            finally:
+                tracemalloc.stop()
+
+            for stage in STAGES:
+                elapsed = seconds[stage]
+                peak = memory.get(stage)
+                print(f"{bank:<12}{stage:<10}{elapsed:>10.4f}{rate(len(pages), elapsed):>10}{rate(n_movements, elapsed):>12}"
+                      f"{'-' if peak is None else f'{peak:.1f}':>10}")
+
+if __name__ == "__main__":
+    main()
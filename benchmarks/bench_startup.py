@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WATCHED_MODULES = ("tkinter", "openpyxl", "xlsxwriter", "numpy", "pandas", "pdfplumber", "pdfminer", "pyarrow")
+GUI_ONLY_MODULES = ("tkinter",)
+NEVER_AT_STARTUP = ("openpyxl", "xlsxwriter", "pyarrow")
+
+SCENARIOS = {
+    "python vacío": "pass",
+    "import analyzerV2": "import analyzerV2",
+    "analyzerV2 --help": (
+        "import io, contextlib, analyzerV2\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        analyzerV2.main(['--help'])\n"
+        "    except SystemExit:\n"
+        "        pass"
+    ),
+    "import batch": "import batch",
+    "import gui_worker": "import gui_worker",
+}
+GUI_SCENARIO = (
+    "ventana pintada",
+    "import analyzerV2\nroot = analyzerV2.build_gui()\nroot.update()\nroot.destroy()",
+)
+
+LOADED_PROBE = (
+    "\nimport sys as _sys, json as _json\n"
+    f"print(_json.dumps([n for n in {WATCHED_MODULES!r} if n in _sys.modules and type(_sys.modules[n]).__name__ != '_LazyModule']))"
+)
+
+def parse_importtime(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        self_us = int(self_us)
+        name = name[1:]
+        level = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), self_us, int(cumulative_us), level))
+    return modules
+
+def run_scenario(code):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + LOADED_PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    modules = parse_importtime(result.stderr)
+    total_us = sum(cumulative for _, _, cumulative, level in modules if level == 0)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return wall, total_us, modules, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque e importaciones (python -X importtime) de los puntos de entrada")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Importaciones más costosas que se listan por escenario")
+    parser.add_argument("--gui", action="store_true", help="Medir también el tiempo hasta pintar la ventana (requiere pantalla)")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fallar si alguna importación (sin contar python vacío) supera estos milisegundos")
+    args = parser.parse_args()
+
+    scenarios = dict(SCENARIOS)
+    if args.gui:
+        scenarios[GUI_SCENARIO[0]] = GUI_SCENARIO[1]
+
+    failures = []
+    heaviest = {}
+    print(f"{'escenario':<20}{'total ms':>10}{'imports ms':>12}  cargados")
+    for name, code in scenarios.items():
+        runs = [run_scenario(code) for _ in range(args.repeat)]
+        wall = statistics.median(run[0] for run in runs) * 1000
+        imports = statistics.median(run[1] for run in runs) / 1000
+        modules, loaded = runs[-1][2], runs[-1][3]
+        print(f"{name:<20}{wall:>10.0f}{imports:>12.1f}  {', '.join(loaded) or '-'}")
+
+        heaviest[name] = sorted((m for m in modules if m[3] == 1), key=lambda m: m[2], reverse=True)[:args.top]
+        unexpected = [m for m in loaded if m in NEVER_AT_STARTUP or (m in GUI_ONLY_MODULES and name != GUI_SCENARIO[0])]
+        if unexpected:
+            failures.append(f"{name}: importa {', '.join(unexpected)} al arrancar")
+        if args.max_ms is not None and name != "python vacío" and imports > args.max_ms:
+            failures.append(f"{name}: {imports:.1f} ms de importaciones, máximo {args.max_ms:g} ms")
+
+    for name, modules in heaviest.items():
+        if name == "python vacío" or not modules:
+            continue
+        print(f"\n{name}: importaciones directas más costosas")
+        for module, _, cumulative, _ in modules:
+            print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+    for failure in failures:
+        print(f"FALLA {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
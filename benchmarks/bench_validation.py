@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from validation import balance_continuity
+
+def synthetic_normalized(n_rows, n_files, missing_saldo=0.3, break_rate=0.001, seed=0):
+    rng = np.random.default_rng(seed)
+    file_codes = np.sort(rng.integers(0, n_files, n_rows))
+    cents = rng.integers(100, 5_000_000, n_rows)
+    es_retiro = rng.random(n_rows) < 0.5
+    retiros = np.where(es_retiro, cents, 0)
+    depositos = np.where(es_retiro, 0, cents)
+    saldos = 10_000_000_000 + np.cumsum(depositos - retiros)
+    breaks = rng.random(n_rows) < break_rate
+    saldos = saldos + np.cumsum(np.where(breaks, rng.integers(-100_000, 100_000, n_rows), 0))
+    saldo = pd.array(saldos, dtype="Int64")
+    saldo[rng.random(n_rows) < missing_saldo] = pd.NA
+    return pd.DataFrame({
+        "Banco": "BANAMEX",
+        "Archivo": pd.Series(file_codes).map(lambda code: f"estado_{code:05d}.pdf"),
+        "Fecha Original": "01 MAR",
+        "Concepto": "SPEI",
+        "Retiro": pd.array(retiros, dtype="Int64"),
+        "Depósito": pd.array(depositos, dtype="Int64"),
+        "Saldo": saldo,
+    })
+
+def per_row_breaks(df):
+    breaks = []
+    previous_file, last_saldo, running = None, None, 0
+    for archivo, retiro, deposito, saldo in zip(df["Archivo"], df["Retiro"], df["Depósito"], df["Saldo"]):
+        if archivo != previous_file:
+            previous_file, last_saldo, running = archivo, None, 0
+        running += deposito - retiro
+        if saldo is pd.NA:
+            continue
+        if last_saldo is not None and last_saldo + running != saldo:
+            breaks.append((archivo, saldo - last_saldo - running))
+        last_saldo, running = saldo, 0
+    return breaks
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Validación de continuidad de saldos: recorrido por fila frente a operaciones vectorizadas en centavos")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--files", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'filas':>10}{'cortes':>8}{'por fila s':>12}{'vectorizado s':>15}{'aceleración':>13}")
+    for n_rows in args.rows:
+        df = synthetic_normalized(n_rows, args.files)
+        loop_seconds, expected = timed(per_row_breaks, df)
+        vector_seconds, (_, breaks) = timed(balance_continuity, df)
+        found = list(zip(breaks["Archivo"], (breaks["Diferencia"]).astype(int)))
+        if found != expected:
+            raise SystemExit(f"Los cortes no coinciden: {len(found)} vectorizados, {len(expected)} por fila")
+        print(f"{n_rows:>10}{len(found):>8}{loop_seconds:>12.2f}{vector_seconds:>15.3f}{loop_seconds / vector_seconds:>12.0f}x")
+
+if __name__ == "__main__":
+    main()
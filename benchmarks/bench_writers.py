@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from writers import write_movements
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MODES = ["to_excel", "xlsx", "csv", "parquet"]
+
+def synthetic_movements(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    montos = rng.integers(100, 500000, n_rows) / 100
+    es_retiro = rng.random(n_rows) < 0.5
+    saldos = 100000 + np.cumsum(np.where(es_retiro, -montos, montos))
+    return pd.DataFrame({
+        "Fecha": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D"),
+        "Concepto": [f"SPEI REFERENCIA {ref}" for ref in rng.integers(100000, 999999, n_rows)],
+        "Retiro": np.where(es_retiro, montos, np.nan),
+        "Depósito": np.where(es_retiro, np.nan, montos),
+        "Saldo": saldos.round(2),
+    })
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+def run_mode(mode, n_rows, out_dir):
+    df = synthetic_movements(n_rows)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "to_excel":
+        path = os.path.join(out_dir, "to_excel.xlsx")
+        df.to_excel(path, index=False)
+    else:
+        path = write_movements(df, os.path.join(out_dir, f"streaming.{mode}"))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"mode": mode, "seconds": elapsed, "peak_rss_mb": peak_rss_mb(),
+                      "baseline_rss_mb": baseline, "size_kb": os.path.getsize(path) / 1024}))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escritura de movimientos: to_excel contra escritores por flujo")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--run", nargs=3, metavar=("MODE", "ROWS", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        mode, n_rows, out_dir = args.run
+        run_mode(mode, int(n_rows), out_dir)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Movimientos sintéticos: {args.rows}")
+        print(f"{'modo':<10}{'segundos':>10}{'RSS pico MB':>13}{'RSS datos MB':>14}{'tamaño KB':>12}")
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", mode, str(args.rows), tmp],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            peak = result["peak_rss_mb"]
+            baseline = result["baseline_rss_mb"]
+            print(f"{mode:<10}{result['seconds']:>10.2f}"
+                  f"{peak if peak is None else round(peak, 1)!s:>13}{baseline if baseline is None else round(baseline, 1)!s:>14}"
+                  f"{result['size_kb']:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import argparse
+import difflib
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzerV2 import extract_pdf_text, parse_statement, section_for
+from geometry import geometry_layouts, parse_statement_geometry
+from writers import output_frame
+from synthetic_pdf import write_pdf
+from synthetic_statements import STATEMENT_GENERATORS
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+GOLDEN_PAGES = 3
+GOLDEN_SEED = 0
+MAX_DIFF_LINES = 20
+
+def golden_cases():
+    for bank in STATEMENT_GENERATORS:
+        yield bank, "text"
+        if bank in geometry_layouts():
+            yield bank, "geometry"
+
+def golden_path(bank, engine):
+    suffix = "" if engine == "text" else "_" + engine
+    return os.path.join(GOLDEN_DIR, f"{bank.lower()}{suffix}.csv")
+
+def render_output(pdf_path, bank, engine):
+    with contextlib.redirect_stderr(open(os.devnull, "w")), contextlib.redirect_stdout(open(os.devnull, "w")):
+        if engine == "geometry":
+            df = parse_statement_geometry(pdf_path, bank)
+        else:
+            df = parse_statement(extract_pdf_text(pdf_path, section=section_for(bank)), bank)
+    return output_frame(df).to_csv(index=False, lineterminator="\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara la salida de cada parser contra los archivos de referencia en benchmarks/golden")
+    parser.add_argument("--update", action="store_true", help="Reescribir los archivos de referencia con la salida actual")
+    args = parser.parse_args()
+
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for bank, engine in golden_cases():
+            pages, _ = STATEMENT_GENERATORS[bank](GOLDEN_PAGES, seed=GOLDEN_SEED)
+            pdf_path = write_pdf(os.path.join(tmp, f"{bank.lower()}.pdf"), pages)
+            output = render_output(pdf_path, bank, engine)
+            path = golden_path(bank, engine)
+
+            if args.update:
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    f.write(output)
+                print(f"actualizado {os.path.relpath(path)}")
+                continue
+
+            try:
+                with open(path, encoding="utf-8", newline="") as f:
+                    expected = f.read()
+            except FileNotFoundError:
+                print(f"FALTA {bank} ({engine}): no existe {os.path.relpath(path)}; ejecute con --update")
+                failures += 1
+                continue
+
+            if output == expected:
+                print(f"ok    {bank} ({engine})")
+                continue
+
+            failures += 1
+            print(f"DIFF  {bank} ({engine})")
+            diff = difflib.unified_diff(expected.splitlines(), output.splitlines(), "referencia", "actual", lineterm="")
+            for i, line in enumerate(diff):
+                if i == MAX_DIFF_LINES:
+                    print("      ...")
+                    break
+                print("      " + line)
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic_pdf import write_pdf
+from synthetic_statements import STATEMENT_GENERATORS
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else float("nan")
+
+async def request(host, port, method, target, body=b""):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    head = f"{method} {target} HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/pdf\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode() + body)
+    await writer.drain()
+    status_line = await reader.readline()
+    first_byte = time.perf_counter() - start
+    response = await reader.read()
+    writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    complete = status != 200 or response.endswith(b"0\r\n\r\n")
+    return status, first_byte, time.perf_counter() - start, complete
+
+async def wait_ready(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status, *_ = await request(host, port, "GET", "/health")
+            if status == 200:
+                return
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"El servicio no respondió en {host}:{port}")
+
+async def load(host, port, uploads, total, clients, output, backoff):
+    results = []
+    counter = iter(range(total))
+
+    async def client():
+        for i in counter:
+            name, body = uploads[i % len(uploads)]
+            try:
+                result = await request(host, port, "POST", f"/extract?filename={name}&format={output}&year=2024", body)
+            except OSError:
+                result = (0, float("nan"), float("nan"), False)
+            results.append(result)
+            if result[0] != 200:
+                await asyncio.sleep(backoff)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    return results, time.perf_counter() - start
+
+def report(results, elapsed, clients):
+    ok = [r for r in results if r[0] == 200 and r[3]]
+    statuses = {}
+    for status, *_ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = [r[2] * 1000 for r in ok]
+    first_bytes = [r[1] * 1000 for r in ok]
+    print(f"{clients:>8}{len(results):>13}{len(ok) / elapsed:>9.1f}{percentile(latencies, 0.5):>9.0f}{percentile(latencies, 0.95):>9.0f}"
+          f"{percentile(latencies, 0.99):>9.0f}{percentile(first_bytes, 0.5):>11.0f}  "
+          + ", ".join(f"{status}: {n}" for status, n in sorted(statuses.items())))
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga local del servicio HTTP de extracción (solicitudes/s y latencia p99)")
+    parser.add_argument("--url", default=None, help="Servicio ya en marcha; si se omite se levanta uno local")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--banks", nargs="+", default=["BANORTE", "BANAMEX", "INBURSA", "SANTANDER"], choices=list(STATEMENT_GENERATORS))
+    parser.add_argument("--backoff", type=float, default=0.1, help="Segundos que espera un cliente tras una respuesta 503 antes de reintentar")
+    parser.add_argument("--format", dest="output", default="json", choices=["json", "ndjson", "csv"])
+    parser.add_argument("--concurrency", type=int, default=None, help="--concurrency del servicio local")
+    parser.add_argument("--queue", type=int, default=None, help="--queue del servicio local")
+    parser.add_argument("--no-cache", action="store_true", help="Levantar el servicio local sin caché de texto")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uploads = []
+        for bank in args.banks:
+            path = write_pdf(os.path.join(tmp, f"{bank.lower()}.pdf"), STATEMENT_GENERATORS[bank](args.pages)[0])
+            with open(path, "rb") as f:
+                uploads.append((os.path.basename(path), f.read()))
+
+        server = None
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            host, port = "127.0.0.1", free_port()
+            command = [sys.executable, os.path.join(ROOT, "analyzerV2.py"), "serve", "--host", host, "--port", str(port),
+                       "--cache-dir", os.path.join(tmp, "cache")]
+            if args.concurrency:
+                command += ["--concurrency", str(args.concurrency)]
+            if args.queue is not None:
+                command += ["--queue", str(args.queue)]
+            if args.no_cache:
+                command.append("--no-cache")
+            server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        try:
+            asyncio.run(wait_ready(host, port))
+            print(f"{len(uploads)} estados sintéticos de {args.pages} páginas, formato {args.output}, servicio en {host}:{port}")
+            print(f"{'clientes':>8}{'solicitudes':>13}{'sol/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'1er byte':>11}  estados")
+            for clients in args.clients:
+                results, elapsed = asyncio.run(load(host, port, uploads, args.requests, clients, args.output, args.backoff))
+                report(results, elapsed, clients)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+if __name__ == "__main__":
+    main()
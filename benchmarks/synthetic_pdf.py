@@ -0,0 +1,70 @@
+import zlib
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+
+HELVETICA_WIDTHS = {
+    " ": 278, ",": 278, ".": 278, "/": 278, "-": 333, "$": 556,
+    "A": 667, "B": 667, "C": 722, "D": 722, "E": 667, "F": 611, "G": 778, "H": 722, "I": 278,
+    "J": 500, "K": 667, "L": 556, "M": 833, "N": 722, "O": 778, "P": 667, "Q": 778, "R": 722,
+    "S": 667, "T": 611, "U": 722, "V": 667, "W": 944, "X": 667, "Y": 667, "Z": 611,
+    "Á": 667, "É": 667, "Í": 278, "Ó": 778, "Ú": 722,
+}
+DEFAULT_WIDTH = 556
+
+def escape_pdf_text(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def text_width(text, font_size=9):
+    return sum(HELVETICA_WIDTHS.get(c, DEFAULT_WIDTH) for c in text) * font_size / 1000
+
+def right_aligned(right, text, font_size=9):
+    return (round(right - text_width(text, font_size), 2), text)
+
+def page_stream(lines, font_size=9, left=36, top=756, leading=11):
+    commands = []
+    y = top
+    for line in lines:
+        if isinstance(line, str):
+            line = [(left, line)]
+        for x, text in line:
+            commands.append(f"BT /F1 {font_size} Tf 1 0 0 1 {x} {y} Tm ({escape_pdf_text(text)}) Tj ET")
+        y -= leading
+    return "\n".join(commands).encode("cp1252", errors="replace")
+
+def write_pdf(path, pages, compress=True):
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        content = page_stream(lines)
+        if compress:
+            content = zlib.compress(content)
+            header = f"<< /Length {len(content)} /Filter /FlateDecode >>".encode()
+        else:
+            header = f"<< /Length {len(content)} >>".encode()
+        objects.append(header + b"\nstream\n" + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+        xref_offset = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode())
+        f.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+    return path
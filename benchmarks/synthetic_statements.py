@@ -0,0 +1,313 @@
+import random
+
+from synthetic_pdf import right_aligned
+
+ROWS_PER_PAGE = 30
+YEAR = 2024
+MONTHS = ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
+MONTH_NAMES = ["ENERO", "FEBRERO", "MARZO", "ABRIL", "MAYO", "JUNIO", "JULIO", "AGOSTO",
+               "SEPTIEMBRE", "OCTUBRE", "NOVIEMBRE", "DICIEMBRE"]
+MULTILINE_RATE = 0.2
+CAMARA_RATE = 0.1
+
+BANAMEX_CONCEPTS = [
+    ("PAGO RECIBIDO DE CLIENTE", False),
+    ("DEPOSITO EN EFECTIVO", False),
+    ("SPEI RECIBIDO HSBC", False),
+    ("COMPRA TARJETA DEBITO", True),
+    ("COMISION MANEJO DE CUENTA", True),
+    ("SPEI ENVIADO PROVEEDOR", True),
+]
+BANCOAZTE_CONCEPTS = [
+    ("DEPOSITO EN EFECTIVO", False),
+    ("SPEI RECIBIDO", False),
+    ("RETIRO EN CAJERO", True),
+    ("PAGO DE SERVICIO", True),
+]
+BANCOMER_CONCEPTS = [
+    ("SPEI RECIBIDO SANTANDER", False),
+    ("DEPOSITO EN EFECTIVO", False),
+    ("ABONO TRANSFERENCIA", False),
+    ("PAGO CUENTA DE TERCERO", True),
+    ("SPEI ENVIADO BANAMEX", True),
+    ("COMISION TRANSFERENCIA", True),
+]
+BANORTE_CONCEPTS = [
+    ("SPEI RECIBIDO DE CLIENTE", False),
+    ("DEPOSITO EN EFECTIVO", False),
+    ("PAGO A PROVEEDOR SPEI", True),
+    ("COMISION POR SERVICIO", True),
+]
+BANREGIO_CONCEPTS = [
+    ("INT SPEI RECIBIDO", False),
+    ("INT DEPOSITO DE CLIENTE", False),
+    ("TRA SPEI ENVIADO", True),
+    ("TRA PAGO A PROVEEDOR", True),
+]
+INBURSA_CONCEPTS = [
+    ("DEPOSITO SPEI", False),
+    ("ABONO POR DEVOLUCION", False),
+    ("PAGO SPEI", True),
+    ("COMISION MANEJO CUENTA", True),
+]
+SANTANDER_CONCEPTS = [
+    ("ABONO TRANSFERENCIA SPEI", False),
+    ("DEPOSITO EN EFECTIVO", False),
+    ("CARGO TRANSFERENCIA SPEI", True),
+    ("PAGO DE SERVICIO", True),
+]
+SCOTIABANK_CONCEPTS = [
+    ("TRASPASO ENTRE CUENTAS", False),
+    ("DEPOSITO EN SUCURSAL", False),
+    ("PAGO DE SERVICIOS", True),
+    ("TRANSFERENCIA SPEI ENVIADA", True),
+]
+
+def format_amount(cents, currency=False):
+    text = f"{cents / 100:,.2f}"
+    return "$" + text if currency else text
+
+def random_movements(rnd, concepts, n_rows, saldo=10_000_000):
+    month = rnd.randrange(12)
+    days = sorted(rnd.randint(1, 28) for _ in range(n_rows))
+    movements = []
+    retiros = [concepto for concepto, es_retiro in concepts if es_retiro]
+    depositos = [concepto for concepto, es_retiro in concepts if not es_retiro]
+    for day in days:
+        monto = rnd.randint(100, 2_500_000)
+        es_retiro = monto <= saldo and rnd.random() < 0.5
+        concepto = rnd.choice(retiros if es_retiro else depositos)
+        saldo += -monto if es_retiro else monto
+        movements.append({
+            "dia": day,
+            "mes": month,
+            "concepto": concepto,
+            "es_retiro": es_retiro,
+            "monto": monto,
+            "saldo": saldo,
+            "referencia": str(rnd.randint(1000000, 9999999)),
+            "multilinea": rnd.random() < MULTILINE_RATE,
+        })
+    return movements
+
+def expected_rows(movements, fecha):
+    return [
+        {
+            "Fecha": fecha(m),
+            "Retiro": m["monto"] if m["es_retiro"] else 0,
+            "Depósito": 0 if m["es_retiro"] else m["monto"],
+        }
+        for m in movements
+    ]
+
+def paginate(movements, header, render_row, footer=None):
+    pages = []
+    n_pages = -(-len(movements) // ROWS_PER_PAGE)
+    for start in range(0, len(movements), ROWS_PER_PAGE):
+        lines = list(header(len(pages) + 1))
+        for movement in movements[start:start + ROWS_PER_PAGE]:
+            lines.extend(render_row(movement))
+        if footer and len(pages) + 1 == n_pages:
+            lines.extend(footer)
+        lines.append(f"Página: {len(pages) + 1} de {n_pages}")
+        pages.append(lines)
+    return pages
+
+def dia_mes(separator):
+    return lambda m: f"{m['dia']:02d}{separator}{MONTHS[m['mes']]}"
+
+def banamex_statement(n_pages, seed=0):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, BANAMEX_CONCEPTS, n_pages * ROWS_PER_PAGE)
+    fecha = dia_mes(" ")
+
+    def header(page_number):
+        return [
+            f"ESTADO DE CUENTA BANAMEX Página: {page_number}",
+            f"ESTADOS DE CUENTA AL 28 DE {MONTH_NAMES[movements[0]['mes']]} DE {YEAR}",
+            "CLIENTE: EMPRESA DEMO SA DE CV",
+            "DETALLE DE OPERACIONES",
+            [(36, "FECHA"), (80, "CONCEPTO"), right_aligned(400, "RETIROS"), right_aligned(480, "DEPOSITOS"), right_aligned(560, "SALDO")],
+        ]
+
+    def row(m):
+        column = 400 if m["es_retiro"] else 480
+        lines = [[(36, fecha(m)), (80, m["concepto"])]]
+        if m["multilinea"]:
+            lines.append([(80, "CONCEPTO ADICIONAL DEL MOVIMIENTO")])
+        lines.append([(80, f"REF {m['referencia']}"), right_aligned(column, format_amount(m["monto"])), right_aligned(560, format_amount(m["saldo"]))])
+        return lines
+
+    pages = paginate(movements, header, row, footer=["SALDO MINIMO REQUERIDO 0.00"])
+    return pages, expected_rows(movements, fecha)
+
+def bancoazte_statement(n_pages, seed=0):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, BANCOAZTE_CONCEPTS, n_pages * ROWS_PER_PAGE)
+
+    def fecha(m):
+        return f"{YEAR}-{m['mes'] + 1:02d}-{m['dia']:02d}"
+
+    def header(page_number):
+        lines = [f"BANCO AZTECA ESTADO DE CUENTA Página: {page_number}"]
+        if page_number == 1:
+            lines.append("Detalle de movimientos realizados")
+        lines.append("FECHA OPERACIÓN FECHA APLICACIÓN FOLIO SUCURSAL CONCEPTO CARGO ABONO SALDO")
+        return lines
+
+    def row(m):
+        cargo = format_amount(m["monto"] if m["es_retiro"] else 0)
+        abono = format_amount(0 if m["es_retiro"] else m["monto"])
+        return [f"{fecha(m)} {fecha(m)} {m['referencia']} 0101 {m['concepto']} {cargo} {abono} {format_amount(m['saldo'])}"]
+
+    pages = paginate(movements, header, row, footer=["Revise cuidadosamente éste Estado de Cuenta.", "UNIDAD ESPECIALIZADA DE ATENCIÓN A USUARIOS"])
+    return pages, expected_rows(movements, fecha)
+
+def bancomer_statement(n_pages, seed=0):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, BANCOMER_CONCEPTS, n_pages * ROWS_PER_PAGE)
+    fecha = dia_mes("/")
+
+    def header(page_number):
+        return [
+            f"BBVA MEXICO ESTADO DE CUENTA Página: {page_number}",
+            "Detalle de Movimientos Realizados",
+            [(36, "FECHA"), (76, "OPER"), (110, "LIQ"), (140, "DESCRIPCIÓN"),
+             right_aligned(380, "CARGOS"), right_aligned(450, "ABONOS"), right_aligned(515, "OPERACIÓN"), right_aligned(576, "LIQUIDACIÓN")],
+        ]
+
+    def row(m):
+        column = 380 if m["es_retiro"] else 450
+        saldo = format_amount(m["saldo"])
+        lines = [[(36, fecha(m)), (76, fecha(m)), (140, m["concepto"]), right_aligned(column, format_amount(m["monto"])),
+                  right_aligned(515, saldo), right_aligned(576, saldo)]]
+        if m["multilinea"]:
+            lines.append([(140, f"REFERENCIA {m['referencia']}")])
+        return lines
+
+    pages = paginate(movements, header, row)
+    return pages, expected_rows(movements, fecha)
+
+def banorte_statement(n_pages, seed=0, saldo_inicial=10_000_000):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, BANORTE_CONCEPTS, n_pages * ROWS_PER_PAGE, saldo=saldo_inicial)
+
+    def fecha(m):
+        return f"{m['dia']:02d}-{MONTHS[m['mes']]}-{YEAR % 100:02d}"
+
+    def header(page_number):
+        lines = [f"ESTADO DE CUENTA BANORTE Página: {page_number}", "FECHA DESCRIPCIÓN / ESTABLECIMIENTO MONTO DEL DEPOSITO MONTO DEL RETIRO SALDO"]
+        if page_number == 1:
+            lines.append(f"01-{MONTHS[movements[0]['mes']]}-{YEAR % 100:02d} SALDO ANTERIOR {format_amount(saldo_inicial)}")
+        return lines
+
+    def row(m):
+        lines = [f"{fecha(m)} {m['concepto']} {format_amount(m['monto'])} {format_amount(m['saldo'])}"]
+        if m["multilinea"]:
+            lines.append(f"REFERENCIA {m['referencia']}")
+        return lines
+
+    pages = paginate(movements, header, row)
+    return pages, expected_rows(movements, fecha)
+
+def banregio_statement(n_pages, seed=0):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, BANREGIO_CONCEPTS, n_pages * ROWS_PER_PAGE)
+    month_name = MONTH_NAMES[movements[0]["mes"]]
+
+    def fecha(m):
+        return f"{m['dia']:02d}/{month_name}/{YEAR}"
+
+    def header(page_number):
+        lines = [f"BANREGIO ESTADO DE CUENTA Página: {page_number}"]
+        if page_number == 1:
+            lines.append(f"Periodo del 01 al 28 de {month_name} {YEAR}")
+        lines.append("DIA CONCEPTO CARGOS ABONOS SALDO")
+        return lines
+
+    def row(m):
+        return [f"{m['dia']:02d} {m['concepto']} {m['referencia']} {format_amount(m['monto'])} {format_amount(m['saldo'])}"]
+
+    pages = paginate(movements, header, row)
+    return pages, expected_rows(movements, fecha)
+
+def inbursa_statement(n_pages, seed=0, saldo_inicial=10_000_000):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, INBURSA_CONCEPTS, n_pages * ROWS_PER_PAGE, saldo=saldo_inicial)
+
+    def fecha(m):
+        return f"{MONTHS[m['mes']]} {m['dia']:02d}"
+
+    def header(page_number):
+        lines = [f"INBURSA ESTADO DE CUENTA Página: {page_number}"]
+        if page_number == 1:
+            lines.extend(["Detalle de movimientos", f"BALANCE INICIAL {format_amount(saldo_inicial)}"])
+        lines.append("FECHA REFERENCIA CONCEPTO CARGOS ABONOS SALDO")
+        return lines
+
+    def row(m):
+        return [f"{fecha(m)} {m['referencia']} {m['concepto']} {format_amount(m['monto'])} {format_amount(m['saldo'])}"]
+
+    pages = paginate(movements, header, row, footer=["Si desea recibir pagos a través de transferencias electrónicas"])
+    return pages, expected_rows(movements, fecha)
+
+def santander_statement(n_pages, seed=0, saldo_inicial=10_000_000):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, SANTANDER_CONCEPTS, n_pages * ROWS_PER_PAGE, saldo=saldo_inicial)
+
+    def fecha(m):
+        return f"{m['dia']:02d}-{MONTHS[m['mes']]}-{YEAR}"
+
+    def header(page_number):
+        lines = [f"Santander ESTADO DE CUENTA Página: {page_number}"]
+        if page_number == 1:
+            lines.extend([
+                "Resumen del periodo",
+                "Detalle de movimientos cuenta de cheques.",
+                f"SALDOFINALDELPERIODOANTERIOR: {format_amount(saldo_inicial, currency=True)}",
+            ])
+        lines.append("FECHA FOLIO DESCRIPCION DEPOSITO RETIRO SALDO")
+        return lines
+
+    def row(m):
+        return [f"{fecha(m)} {m['referencia']} {m['concepto']} REF {m['referencia'][:5]} {format_amount(m['monto'])} {format_amount(m['saldo'])}"]
+
+    pages = paginate(movements, header, row, footer=["Detalles de movimientos Dinero Creciente Santander.", "SIN MOVIMIENTOS"])
+    return pages, expected_rows(movements, fecha)
+
+def scotiabank_statement(n_pages, seed=0, saldo_inicial=10_000_000):
+    rnd = random.Random(seed)
+    movements = random_movements(rnd, SCOTIABANK_CONCEPTS, n_pages * ROWS_PER_PAGE, saldo=saldo_inicial)
+    fecha = dia_mes(" ")
+    for m in movements:
+        if not m["es_retiro"] and rnd.random() < CAMARA_RATE:
+            m["concepto"] = "DEPOSITOS SBC CAMARA"
+
+    def header(page_number):
+        lines = [f"SCOTIABANK ESTADO DE CUENTA Página: {page_number}"]
+        if page_number == 1:
+            lines.append(f"Saldo inicial {format_amount(saldo_inicial, currency=True)}")
+        lines.append([(36, "Fecha"), (80, "Concepto"), (260, "Origen/Referencia"),
+                      right_aligned(430, "Depósito"), right_aligned(500, "Retiro"), right_aligned(576, "Saldo")])
+        return lines
+
+    def row(m):
+        column = 500 if m["es_retiro"] else 430
+        amounts = [right_aligned(column, format_amount(m["monto"], currency=True)), right_aligned(576, format_amount(m["saldo"], currency=True))]
+        if m["concepto"] == "DEPOSITOS SBC CAMARA":
+            return [[(36, fecha(m)), (80, m["concepto"])], [(80, "DEPOSITO CAMARA"), (260, m["referencia"]), *amounts]]
+        return [[(36, fecha(m)), (80, m["concepto"]), (260, m["referencia"]), *amounts]]
+
+    pages = paginate(movements, header, row)
+    return pages, expected_rows(movements, fecha)
+
+STATEMENT_GENERATORS = {
+    "BANAMEX": banamex_statement,
+    "BANCOAZTE": bancoazte_statement,
+    "BANCOMER": bancomer_statement,
+    "BANORTE": banorte_statement,
+    "BANREGIO": banregio_statement,
+    "INBURSA": inbursa_statement,
+    "SANTANDER": santander_statement,
+    "SCOTIABANK": scotiabank_statement,
+}
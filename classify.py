@@ -0,0 +1,45 @@
+from lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+from metrics import span
+
+RECONCILIATION_COLUMN = "Descuadre"
+BALANCE_COLUMN = "Saldo Leído"
+OPENING_BALANCE_COLUMN = "Saldo Inicial"
+INTERNAL_COLUMNS = (BALANCE_COLUMN, OPENING_BALANCE_COLUMN)
+
+def cents_values(values):
+    values = pd.array(values, dtype="Int64", copy=False)
+    return values.to_numpy(dtype=np.int64, na_value=0), values.isna()
+
+def previous_balances(saldos, saldo_missing, saldo_inicial, restarts=None):
+    previos = np.empty_like(saldos)
+    previo_missing = np.empty_like(saldo_missing)
+    if len(saldos):
+        previos[0] = 0 if saldo_inicial is None else saldo_inicial
+        previo_missing[0] = saldo_inicial is None
+        previos[1:] = saldos[:-1]
+        previo_missing[1:] = saldo_missing[:-1]
+    for index, saldo in (restarts or {}).items():
+        if index < len(previos):
+            previos[index] = saldo
+            previo_missing[index] = False
+    return previos, previo_missing
+
+def classify_by_balance(montos, saldos, saldo_inicial, retiro_on_tie=False, restarts=None):
+    with span("classify"):
+        montos, monto_missing = cents_values(montos)
+        saldos, saldo_missing = cents_values(saldos)
+        previos, previo_missing = previous_balances(saldos, saldo_missing, saldo_inicial, restarts)
+        comparable = ~(saldo_missing | previo_missing)
+
+        if retiro_on_tie:
+            es_retiro = ~((saldos > previos) & comparable)
+        else:
+            es_retiro = (saldos < previos) & comparable
+
+        retiros = pd.arrays.IntegerArray(np.where(es_retiro, montos, 0), es_retiro & monto_missing)
+        depositos = pd.arrays.IntegerArray(np.where(es_retiro, 0, montos), ~es_retiro & monto_missing)
+        descuadre = ~comparable | monto_missing | (np.abs(saldos - previos) != montos)
+        return es_retiro, retiros, depositos, descuadre
@@ -0,0 +1,126 @@
+from array import array
+
+from lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+MISSING_CENTS = -(2 ** 63)
+MISSING_CODE = -1
+
+class StringPool:
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def intern(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def map(self, function):
+        self.values = [function(value) for value in self.values]
+        self.codes = {}
+        for code, value in enumerate(self.values):
+            self.codes.setdefault(value, code)
+
+class TextColumn:
+    def __init__(self, pool=None):
+        self.pool = pool if pool is not None else StringPool()
+        self.codes = array("i")
+
+    def append(self, value):
+        self.codes.append(MISSING_CODE if value is None else self.pool.intern(value))
+
+    def __getitem__(self, i):
+        code = self.codes[i]
+        return None if code == MISSING_CODE else self.pool.values[code]
+
+    def code_array(self):
+        return np.frombuffer(self.codes, dtype=np.int32) if self.codes else np.empty(0, dtype=np.int32)
+
+    def to_numpy(self):
+        values = np.array(self.pool.values + [np.nan], dtype=object)
+        return values[self.code_array()]
+
+    def to_array(self):
+        if len(self.pool.codes) < len(self.pool.values):
+            return pd.Categorical(self.to_numpy())
+        return pd.Categorical.from_codes(self.code_array(), dtype=pd.CategoricalDtype(self.pool.values))
+
+    def to_arrow(self):
+        import pyarrow as pa
+        codes = self.code_array()
+        mask = codes == MISSING_CODE
+        return pa.DictionaryArray.from_arrays(pa.array(codes, mask=mask if mask.any() else None), pa.array(self.pool.values, pa.string()))
+
+class CentsColumn:
+    def __init__(self):
+        self.cents = array("q")
+
+    def append(self, value):
+        if value is None or value != value:
+            self.cents.append(MISSING_CENTS)
+        else:
+            self.cents.append(int(value))
+
+    def __getitem__(self, i):
+        cents = self.cents[i]
+        return None if cents == MISSING_CENTS else cents
+
+    def cents_array(self):
+        return np.frombuffer(self.cents, dtype=np.int64) if self.cents else np.empty(0, dtype=np.int64)
+
+    def to_array(self):
+        cents = self.cents_array()
+        return pd.arrays.IntegerArray(cents, cents == MISSING_CENTS)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        cents = self.cents_array()
+        mask = cents == MISSING_CENTS
+        return pa.array(cents, mask=mask if mask.any() else None)
+
+COLUMN_KINDS = {
+    "text": TextColumn,
+    "cents": CentsColumn,
+}
+
+class MovementColumns:
+    def __init__(self, schema):
+        self.schema = dict(schema)
+        self.columns = {name: COLUMN_KINDS[kind]() for name, kind in self.schema.items()}
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return self.length > 0
+
+    def append(self, row):
+        for name, column in self.columns.items():
+            column.append(row.get(name))
+        self.length += 1
+
+    def __getitem__(self, i):
+        return {name: column[i] for name, column in self.columns.items()}
+
+    def __iter__(self):
+        return (self[i] for i in range(self.length))
+
+    def column(self, name):
+        return self.columns[name].to_array()
+
+    def map_text(self, name, function):
+        self.columns[name].pool.map(function)
+
+    def to_frame(self):
+        if not self.length:
+            return pd.DataFrame()
+        return pd.DataFrame({name: column.to_array() for name, column in self.columns.items()}, copy=False)
+
+    def to_arrow(self):
+        import pyarrow as pa
+        return pa.table({name: column.to_arrow() for name, column in self.columns.items()})
@@ -0,0 +1,52 @@
+from lazy import lazy_import
+pdfplumber = lazy_import("pdfplumber")
+
+from extraction import TEXT_SETTINGS, release_page
+from banks import load_registry
+from metrics import count
+
+AUTO_BANK = "AUTO"
+MIN_SCORE = 3
+DETECTION_PAGES = 2
+
+def score_text(text):
+    return {
+        bank: sum(weight for pattern, weight in spec.fingerprints if pattern.search(text))
+        for bank, spec in load_registry().items()
+    }
+
+def detect_bank(text):
+    scores = score_text(text)
+    ranking = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    best_bank, best_score = ranking[0]
+    if best_score < MIN_SCORE or best_score == ranking[1][1]:
+        return None
+    return best_bank
+
+def metadata_text(metadata):
+    return "\n".join(str(value) for value in metadata.values() if isinstance(value, (str, bytes)))
+
+def detect_bank_from_texts(page_texts, text="", max_pages=DETECTION_PAGES):
+    for page_text in page_texts[:max_pages]:
+        text += "\n" + page_text
+        bank = detect_bank(text)
+        if bank is not None:
+            return bank
+    return None
+
+def detect_bank_from_pages(pdf_path, max_pages=DETECTION_PAGES):
+    page_texts = []
+    with pdfplumber.open(pdf_path) as pdf:
+        text = metadata_text(pdf.metadata or {})
+        for page in pdf.pages[:max_pages]:
+            page_texts.append(page.extract_text(**TEXT_SETTINGS) or "")
+            release_page(page)
+            count("pages_extracted")
+            text += "\n" + page_texts[-1]
+            bank = detect_bank(text)
+            if bank is not None:
+                return bank, page_texts
+    return None, page_texts
+
+def detect_bank_from_pdf(pdf_path, max_pages=DETECTION_PAGES):
+    return detect_bank_from_pages(pdf_path, max_pages)[0]
@@ -0,0 +1,117 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from lazy import lazy_import
+pdfplumber = lazy_import("pdfplumber")
+
+from metrics import count
+
+MIN_PAGES_PER_WORKER = 25
+TEXT_SETTINGS = {}
+CROP_MARGIN = 2
+
+def release_page(page):
+    if hasattr(page, "close"):
+        page.close()
+    else:
+        page.flush_cache()
+
+def iter_page_texts(pdf_path, start=0, stop=None):
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[start:stop]:
+            text = page.extract_text(**TEXT_SETTINGS)
+            release_page(page)
+            count("pages_extracted")
+            yield text or ""
+
+def count_pages(pdf_path):
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+def page_ranges(n_pages, n_chunks):
+    n_chunks = max(1, min(n_chunks, n_pages))
+    size, extra = divmod(n_pages, n_chunks)
+    ranges = []
+    start = 0
+    for i in range(n_chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+def extract_page_range(pdf_path, start, stop):
+    return list(iter_page_texts(pdf_path, start, stop))
+
+def extract_page_texts(pdf_path, workers=1, min_pages_per_worker=MIN_PAGES_PER_WORKER, first_pages=None):
+    page_texts = list(first_pages or [])
+    start = len(page_texts)
+    if workers > 1:
+        n_pages = count_pages(pdf_path) - start
+        n_chunks = min(workers, n_pages // min_pages_per_worker)
+    else:
+        n_chunks = 1
+
+    if n_chunks <= 1:
+        return page_texts + list(iter_page_texts(pdf_path, start))
+
+    ranges = [(start + first, start + last) for first, last in page_ranges(n_pages, n_chunks)]
+    with ProcessPoolExecutor(max_workers=n_chunks) as executor:
+        chunks = executor.map(
+            extract_page_range,
+            [pdf_path] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+        )
+        for chunk in chunks:
+            page_texts.extend(chunk)
+            count("pages_extracted", len(chunk))
+    return page_texts
+
+def join_page_texts(page_texts):
+    return "".join(page_texts)
+
+def compact(text):
+    return "".join(text.split())
+
+def find_marker(page, marker):
+    chars = [char for char in page.chars if not char["text"].isspace()]
+    target = compact(marker)
+    index = "".join(char["text"] for char in chars).find(target)
+    if index == -1:
+        return None
+    found = chars[index:index + len(target)]
+    return min(char["top"] for char in found), max(char["bottom"] for char in found)
+
+def iter_section_page_texts(pdf, start_marker, end_marker):
+    started = False
+    for page in pdf.pages:
+        x0, page_top, x1, page_bottom = page.bbox
+        top = page_top
+        bottom = page_bottom
+
+        if not started:
+            start = find_marker(page, start_marker)
+            if start is None:
+                release_page(page)
+                count("pages_extracted")
+                continue
+            started = True
+            top = max(page_top, start[0] - CROP_MARGIN)
+
+        end = find_marker(page, end_marker)
+        finished = end is not None and end[0] >= top
+        if finished:
+            bottom = min(page_bottom, end[1] + CROP_MARGIN)
+
+        region = page if (top, bottom) == (page_top, page_bottom) else page.within_bbox((x0, top, x1, bottom))
+        text = region.extract_text(**TEXT_SETTINGS)
+        release_page(page)
+        count("pages_extracted")
+        yield text or ""
+
+        if finished:
+            return
+
+def extract_section_page_texts(pdf_path, start_marker, end_marker):
+    with pdfplumber.open(pdf_path) as pdf:
+        page_texts = list(iter_section_page_texts(pdf, start_marker, end_marker))
+    return page_texts or None
@@ -0,0 +1,204 @@
+import unicodedata
+
+from lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pdfplumber = lazy_import("pdfplumber")
+
+from extraction import release_page
+from classify import RECONCILIATION_COLUMN, classify_by_balance
+from metrics import count, span
+from columnar import MovementColumns
+from banks import load_registry
+from patterns import AMOUNT_PATTERN, parse_amount
+
+WORD_SETTINGS = {"x_tolerance": 1.5, "y_tolerance": 3}
+WORD_KEYS = ("text", "x0", "x1", "top", "bottom")
+LINE_TOLERANCE = 3
+MAX_ROW_GAP = 2.5
+
+def geometry_layouts():
+    return {bank: spec.geometry for bank, spec in load_registry().items() if spec.geometry is not None}
+
+def normalize_label(text):
+    decomposed = unicodedata.normalize("NFKD", text.upper())
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).strip(".:")
+
+def group_lines(words, tolerance=LINE_TOLERANCE):
+    lines = []
+    for word in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if lines and word["top"] - lines[-1][0]["top"] <= tolerance:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    for line in lines:
+        line.sort(key=lambda w: w["x0"])
+    return lines
+
+def amount_token(text):
+    token = text.lstrip("$")
+    if AMOUNT_PATTERN.fullmatch(token):
+        return parse_amount(token)
+    return None
+
+class ColumnBands:
+    def __init__(self, headers):
+        self.names = [name for name, _ in headers]
+        rights = [word["x1"] for _, word in headers]
+        self.limits = [(a + b) / 2 for a, b in zip(rights, rights[1:])]
+        self.amounts_start = headers[0][1]["x0"]
+        self.bottom = max(word["bottom"] for _, word in headers)
+
+    @classmethod
+    def from_line(cls, line, columns):
+        found = {}
+        for word in line:
+            label = normalize_label(word["text"])
+            for name, labels in columns.items():
+                if label in labels and name not in found:
+                    found[name] = word
+        if len(found) < len(columns):
+            return None
+        return cls(sorted(found.items(), key=lambda item: item[1]["x1"]))
+
+    def column_for(self, word):
+        x1 = word["x1"]
+        for name, limit in zip(self.names, self.limits):
+            if x1 < limit:
+                return name
+        return self.names[-1]
+
+class GeometryParser:
+    def __init__(self, layout):
+        self.layout = layout
+        self.bands = None
+        self.rows = MovementColumns({
+            layout["fecha_column"]: "text",
+            layout["concepto_column"]: "text",
+            **{name: "cents" for name in layout["columns"]},
+        })
+        self.current = None
+        self.stopped = False
+
+    def new_row(self, fecha, concepto):
+        row = {self.layout["fecha_column"]: fecha, self.layout["concepto_column"]: concepto}
+        for name in self.layout["columns"]:
+            row[name] = None
+        return row
+
+    def close_row(self):
+        if self.current is not None:
+            self.rows.append(self.current)
+            self.current = None
+
+    def split_line(self, line):
+        concepto = []
+        amounts = []
+        for word in line:
+            if word["x1"] > self.bands.amounts_start:
+                cents = amount_token(word["text"])
+                if cents is not None:
+                    amounts.append((self.bands.column_for(word), cents))
+                    continue
+            concepto.append(word["text"])
+        return concepto, amounts
+
+    def feed_line(self, line):
+        words = [word["text"] for word in line]
+        date_words = self.layout["date_words"]
+        if len(words) >= date_words and self.layout["date_pattern"].match(" ".join(words[:date_words])):
+            self.close_row()
+            concepto, amounts = self.split_line(line[date_words:])
+            self.current = self.new_row(" ".join(words[:self.layout["fecha_words"]]), " ".join(concepto))
+        elif self.current is not None:
+            concepto, amounts = self.split_line(line)
+            if concepto:
+                self.current[self.layout["concepto_column"]] = " ".join([self.current[self.layout["concepto_column"]], *concepto]).strip()
+        else:
+            return
+
+        for name, cents in amounts:
+            if self.current[name] is None:
+                self.current[name] = cents
+
+    def feed_page(self, words):
+        stop = self.layout["stop"]
+        previous_bottom = None
+        for line in group_lines(words):
+            text = " ".join(word["text"] for word in line)
+            if stop and stop in text:
+                self.stopped = True
+                break
+
+            bands = ColumnBands.from_line(line, self.layout["columns"])
+            if bands is not None:
+                self.close_row()
+                self.bands = bands
+                previous_bottom = bands.bottom
+                continue
+            if self.bands is None:
+                continue
+
+            height = line[0]["bottom"] - line[0]["top"]
+            if previous_bottom is not None and line[0]["top"] - previous_bottom > MAX_ROW_GAP * height:
+                self.close_row()
+            self.feed_line(line)
+            previous_bottom = max(word["bottom"] for word in line)
+        self.close_row()
+
+    def parse(self, pages):
+        for words in pages:
+            self.feed_page(words)
+            if self.stopped:
+                break
+        return self.rows
+
+def iter_page_words(pdf_path):
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            words = page.extract_words(**WORD_SETTINGS)
+            release_page(page)
+            count("pages")
+            count("pages_extracted")
+            yield words
+
+def cached_page_words(pdf_path, cache, file_digest=None):
+    with span("extract"):
+        lookups_before = (cache.hits, cache.misses)
+        key = cache.key_for(pdf_path, {"extract_words": WORD_SETTINGS}, file_digest)
+        pages = cache.get(key)
+        if pages is None:
+            pages = [[{name: word[name] for name in WORD_KEYS} for word in words] for words in iter_page_words(pdf_path)]
+            cache.put(key, pages)
+        else:
+            count("pages", len(pages))
+        count("cache_hits", cache.hits - lookups_before[0])
+        count("cache_misses", cache.misses - lookups_before[1])
+        return pages
+
+def rows_to_frame(rows, layout):
+    columns = [layout["fecha_column"], layout["concepto_column"], *layout["columns"]]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+
+    df = rows.to_frame()
+    for name in (layout["retiro_column"], layout["deposito_column"]):
+        df[name] = df[name].fillna(0)
+
+    if "Saldo" in layout["columns"]:
+        retiro = rows.column(layout["retiro_column"]).to_numpy(dtype=np.int64, na_value=0)
+        deposito = rows.column(layout["deposito_column"]).to_numpy(dtype=np.int64, na_value=0)
+        saldos = rows.column("Saldo")
+        es_retiro, _, _, descuadre = classify_by_balance(retiro + deposito, saldos, None)
+        tiene_previo = np.r_[False, ~saldos.isna()[:-1]]
+        df[RECONCILIATION_COLUMN] = tiene_previo & (descuadre | (es_retiro != (retiro > 0)))
+    return df
+
+def parse_statement_geometry(pdf_path, bank, cache=None, file_digest=None):
+    layout = geometry_layouts()[bank]
+    pages = iter_page_words(pdf_path) if cache is None else cached_page_words(pdf_path, cache, file_digest)
+    with span("parse"):
+        rows = GeometryParser(layout).parse(pages)
+        df_movements = rows_to_frame(rows, layout)
+    count("movements", len(df_movements))
+    return df_movements
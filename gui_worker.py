@@ -0,0 +1,145 @@
+import os
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+from extraction import count_pages
+from metrics import Metrics, collecting, profile_path_for, profiled
+from ocr import with_ocr_workers, workers_per_file
+
+_events = None
+_cancel = None
+
+class Cancelled(Exception):
+    pass
+
+class ProgressMetrics(Metrics):
+    def __init__(self, job_id, events, cancel, **labels):
+        super().__init__(**labels)
+        self.job_id = job_id
+        self.events = events
+        self.cancel = cancel
+
+    def check_cancelled(self):
+        if self.cancel.is_set():
+            raise Cancelled()
+
+    def span(self, name):
+        self.check_cancelled()
+        return super().span(name)
+
+    def count(self, name, n=1):
+        super().count(name, n)
+        if name == "pages_extracted":
+            self.events.put(("pages", self.job_id, n))
+        self.check_cancelled()
+
+def init_worker(events, cancel):
+    global _events, _cancel
+    import analyzerV2
+    _events = events
+    _cancel = cancel
+    analyzerV2.warning_sink = lambda title, message: events.put(("warning", title, message))
+
+def run_job(job_id, pdf_path, bank, save_path, cache_options=None, extract_workers=1, profile_dir=None, profiler="cprofile",
+            ocr_options=None):
+    from batch import process_statement
+    from text_cache import get_text_cache
+    from writers import write_movements
+
+    metrics = ProgressMetrics(job_id, _events, _cancel, archivo=os.path.basename(pdf_path), banco=bank, engine="text")
+    profile_path = profile_path_for(pdf_path, profile_dir, profiler) if profile_dir else None
+    _events.put(("total", job_id, count_pages(pdf_path)))
+    cache = get_text_cache(*cache_options) if cache_options is not None else None
+
+    with collecting(metrics), profiled(profile_path, profiler):
+        bank, df_movements, _ = process_statement(pdf_path, bank, cache=cache, workers=extract_workers, ocr_options=ocr_options)
+        metrics.labels["banco"] = bank
+        with metrics.span("export"):
+            write_movements(df_movements, save_path)
+    return {"Banco": bank, "Salida": save_path, "Movimientos": len(df_movements), "Métricas": metrics.to_record()}
+
+class JobRunner:
+    def __init__(self, jobs, bank, cache_options=None, profile_dir=None, profiler="cprofile", max_workers=None, ocr_options=None):
+        self.jobs = list(jobs)
+        self.bank = bank
+        self.cache_options = cache_options
+        self.profile_dir = profile_dir
+        self.profiler = profiler
+        self.ocr_options = ocr_options
+        self.max_workers = max(1, min(len(self.jobs), max_workers or os.cpu_count() or 1))
+        self.context = multiprocessing.get_context("spawn")
+        self.events = self.context.Queue()
+        self.cancel_event = self.context.Event()
+        self.executor = None
+        self.futures = {}
+        self.pages_total = {}
+        self.pages_done = {}
+        self.warnings = []
+        self.cancelled = False
+
+    def start(self):
+        extract_workers = workers_per_file(len(self.jobs))
+        ocr_options = with_ocr_workers(self.ocr_options, len(self.jobs))
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.context,
+            initializer=init_worker,
+            initargs=(self.events, self.cancel_event),
+        )
+        for job_id, (pdf_path, save_path) in enumerate(self.jobs):
+            future = self.executor.submit(run_job, job_id, pdf_path, self.bank, save_path, self.cache_options,
+                                          extract_workers, self.profile_dir, self.profiler, ocr_options)
+            self.futures[future] = job_id
+
+    def cancel(self):
+        self.cancelled = True
+        self.cancel_event.set()
+        for future in self.futures:
+            future.cancel()
+
+    def drain_events(self):
+        while True:
+            try:
+                kind, *payload = self.events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "total":
+                job_id, pages = payload
+                self.pages_total[job_id] = pages
+            elif kind == "pages":
+                job_id, pages = payload
+                self.pages_done[job_id] = self.pages_done.get(job_id, 0) + pages
+            elif kind == "warning":
+                self.warnings.append(tuple(payload))
+
+    def result_for(self, future, job_id):
+        pdf_path = self.jobs[job_id][0]
+        result = {"Archivo": pdf_path, "Banco": self.bank, "Salida": None, "Movimientos": 0, "Error": None}
+        try:
+            result.update(future.result())
+        except (Cancelled, CancelledError):
+            result["Error"] = "Cancelado"
+        except Exception as e:
+            result["Error"] = f"{type(e).__name__}: {e}"
+        else:
+            self.pages_done[job_id] = self.pages_total.get(job_id, 0)
+        return result
+
+    def poll(self):
+        self.drain_events()
+        finished = [future for future in self.futures if future.done()]
+        results = [self.result_for(future, self.futures.pop(future)) for future in finished]
+        if not self.futures and self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        return results
+
+    @property
+    def done(self):
+        return not self.futures
+
+    def progress(self):
+        total = sum(self.pages_total.values())
+        done = sum(min(self.pages_done.get(job_id, 0), pages) for job_id, pages in self.pages_total.items())
+        return done, total
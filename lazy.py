@@ -0,0 +1,25 @@
+import sys
+import importlib
+import importlib.util
+
+HEAVY_MODULES = ("numpy", "pandas", "pdfplumber")
+
+def lazy_import(name):
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+def preload(*names):
+    modules = [importlib.import_module(name) for name in names]
+    for module in modules:
+        module.__name__
+    return modules
@@ -0,0 +1,197 @@
+import os
+import sys
+import time
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lazy import HEAVY_MODULES, lazy_import, preload
+pd = lazy_import("pandas")
+
+from text_cache import file_sha256
+from writers import open_writer
+from schema import CENT
+
+DEFAULT_LEDGER_PATH = "movimientos.sqlite"
+FETCH_SIZE = 10_000
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archivos (
+    sha256 TEXT PRIMARY KEY,
+    archivo TEXT NOT NULL,
+    banco TEXT NOT NULL,
+    cuenta TEXT NOT NULL,
+    movimientos INTEGER NOT NULL,
+    nuevos INTEGER NOT NULL,
+    ingresado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS movimientos (
+    id INTEGER PRIMARY KEY,
+    banco TEXT NOT NULL,
+    cuenta TEXT NOT NULL,
+    fecha TEXT,
+    fecha_original TEXT NOT NULL,
+    concepto TEXT,
+    retiro INTEGER NOT NULL,
+    deposito INTEGER NOT NULL,
+    saldo INTEGER,
+    ocurrencia INTEGER NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES archivos(sha256),
+    archivo TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS movimientos_clave ON movimientos (
+    banco, cuenta, ifnull(fecha, fecha_original), retiro, deposito, ifnull(saldo, -1), ocurrencia
+);
+CREATE INDEX IF NOT EXISTS movimientos_fecha ON movimientos (fecha);
+"""
+
+EXPORT_COLUMNS = ["Banco", "Cuenta", "Fecha", "Concepto", "Retiro", "Depósito", "Saldo", "Archivo"]
+EXPORT_TYPES = {
+    "Banco": "string", "Cuenta": "string", "Fecha": "string", "Concepto": "string",
+    "Retiro": "decimal", "Depósito": "decimal", "Saldo": "decimal", "Archivo": "string",
+}
+
+def movement_records(df_normalized, cuenta, sha256):
+    fechas = df_normalized["Fecha"].dt.strftime("%Y-%m-%d")
+    retiros = df_normalized["Retiro"].fillna(0)
+    depositos = df_normalized["Depósito"].fillna(0)
+
+    seen = Counter()
+    records = []
+    for banco, archivo, fecha, fecha_original, concepto, retiro, deposito, saldo in zip(
+            df_normalized["Banco"].astype(str), df_normalized["Archivo"], fechas, df_normalized["Fecha Original"],
+            df_normalized["Concepto"], retiros, depositos, df_normalized["Saldo"]):
+        fecha = None if pd.isna(fecha) else fecha
+        saldo = None if pd.isna(saldo) else int(saldo)
+        key = (fecha or fecha_original, int(retiro), int(deposito), saldo)
+        records.append((banco, cuenta, fecha, fecha_original, concepto, int(retiro), int(deposito), saldo, seen[key], sha256, archivo))
+        seen[key] += 1
+    return records
+
+class Ledger:
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(LEDGER_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def is_ingested(self, sha256):
+        row = self.connection.execute("SELECT 1 FROM archivos WHERE sha256 = ?", (sha256,)).fetchone()
+        return row is not None
+
+    def add_statement(self, records, sha256, archivo, bank, cuenta):
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO archivos (sha256, archivo, banco, cuenta, movimientos, nuevos, ingresado) VALUES (?, ?, ?, ?, ?, 0, ?)",
+                (sha256, archivo, bank, cuenta, len(records), datetime.now().isoformat(timespec="seconds")),
+            )
+            before = self.connection.total_changes
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO movimientos (banco, cuenta, fecha, fecha_original, concepto, retiro, deposito, saldo, "
+                "ocurrencia, sha256, archivo) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            inserted = self.connection.total_changes - before
+            self.connection.execute("UPDATE archivos SET nuevos = ? WHERE sha256 = ?", (inserted, sha256))
+        return inserted
+
+    def iter_movements(self, desde=None, hasta=None, bank=None, cuenta=None):
+        conditions = []
+        params = []
+        if desde:
+            conditions.append("fecha >= ?")
+            params.append(desde)
+        if hasta:
+            conditions.append("fecha <= ?")
+            params.append(hasta)
+        if bank:
+            conditions.append("banco = ?")
+            params.append(bank)
+        if cuenta is not None:
+            conditions.append("cuenta = ?")
+            params.append(cuenta)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = self.connection.execute(
+            "SELECT banco, cuenta, ifnull(fecha, fecha_original), concepto, retiro, deposito, saldo, archivo "
+            f"FROM movimientos{where} ORDER BY fecha IS NULL, fecha, id",
+            params,
+        )
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                return
+            for banco, cuenta_row, fecha, concepto, retiro, deposito, saldo, archivo in rows:
+                yield (banco, cuenta_row, fecha, concepto, retiro * CENT, deposito * CENT,
+                       None if saldo is None else saldo * CENT, archivo)
+
+    def export(self, out_path, desde=None, hasta=None, bank=None, cuenta=None):
+        with open_writer(out_path, EXPORT_COLUMNS, EXPORT_TYPES) as writer:
+            writer.write_rows(self.iter_movements(desde, hasta, bank, cuenta))
+            return writer.rows_written
+
+def run_ingest(bank, in_dir, cuenta, db_path=DEFAULT_LEDGER_PATH, workers=None, cache_options=None, section_only=False, engine="text",
+               year=None):
+    from batch import list_pdfs, run_statement
+
+    pdf_paths = list_pdfs(in_dir)
+    if not pdf_paths:
+        print(f"No se encontraron archivos PDF en {in_dir}", file=sys.stderr)
+        return []
+
+    start = time.perf_counter()
+    failures = []
+    totals = Counter()
+    with Ledger(db_path) as ledger:
+        pending = {}
+        for pdf_path in pdf_paths:
+            sha256 = file_sha256(pdf_path)
+            if ledger.is_ingested(sha256) or sha256 in pending.values():
+                totals["omitidos"] += 1
+                print(f"omitido {os.path.basename(pdf_path)}: ya está en el libro")
+            else:
+                pending[pdf_path] = sha256
+
+        if pending:
+            workers = workers or os.cpu_count() or 1
+            print(f"Ingresando {len(pending)} archivos nuevos con {workers} procesos...")
+            preload(*HEAVY_MODULES)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(run_statement, pdf_path, bank, cache_options=cache_options, section_only=section_only, engine=engine,
+                                    normalized=True, year=year, file_digest=sha256)
+                    for pdf_path, sha256 in pending.items()
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    pdf_path = result["Archivo"]
+                    name = os.path.basename(pdf_path)
+                    if result["Error"]:
+                        failures.append(result)
+                        print(f"ERROR {name}: {result['Error']}")
+                        continue
+
+                    records = movement_records(result["Normalizado"], cuenta, pending[pdf_path])
+                    inserted = ledger.add_statement(records, pending[pdf_path], name, result["Banco"], cuenta)
+                    totals["nuevos"] += inserted
+                    totals["duplicados"] += len(records) - inserted
+                    print(f"{name} ({result['Banco']}): {len(records)} movimientos, {inserted} nuevos, {len(records) - inserted} duplicados")
+
+    elapsed = time.perf_counter() - start
+    print(f"Terminado en {elapsed:.1f} s: {totals['nuevos']} movimientos nuevos, {totals['duplicados']} duplicados, "
+          f"{totals['omitidos']} archivos omitidos, {len(failures)} con error. Libro: {db_path}")
+    return failures
+
+def run_export(out_path, db_path=DEFAULT_LEDGER_PATH, desde=None, hasta=None, bank=None, cuenta=None):
+    with Ledger(db_path) as ledger:
+        rows = ledger.export(out_path, desde, hasta, bank, cuenta)
+    print(f"Exportados {rows} movimientos a {out_path}")
+    return rows
@@ -0,0 +1,102 @@
+from metrics import count
+from columnar import MovementColumns
+
+def iter_lines(source):
+    if isinstance(source, str):
+        source = (source,)
+    pending = ""
+    for chunk in source:
+        start = 0
+        while True:
+            end = chunk.find("\n", start)
+            if end == -1:
+                pending += chunk[start:]
+                break
+            yield pending + chunk[start:end]
+            pending = ""
+            start = end + 1
+    yield pending
+
+class LineStateMachine:
+    columns = None
+
+    def __init__(self, columns=None):
+        columns = self.columns if columns is None else columns
+        self.rows = MovementColumns(columns) if columns is not None else []
+        self.current = None
+        self.lines_scanned = 0
+        self.lines_skipped = 0
+        self.lines_matched = 0
+        self.lines_rejected = 0
+
+    def normalize(self, line):
+        return line
+
+    def stop(self, line):
+        return False
+
+    def skip(self, line):
+        return False
+
+    def starts_row(self, line):
+        raise NotImplementedError
+
+    def open_row(self, line):
+        raise NotImplementedError
+
+    def continue_row(self, row, line):
+        return True
+
+    def emit(self, row):
+        self.rows.append(row)
+
+    def close_row(self):
+        if self.current is not None:
+            self.emit(self.current)
+            self.current = None
+
+    def feed(self, line):
+        self.lines_scanned += 1
+        line = self.normalize(line)
+        if self.skip(line):
+            self.lines_skipped += 1
+        else:
+            self.handle(line)
+
+    def handle(self, line):
+        if self.starts_row(line):
+            self.lines_matched += 1
+            self.close_row()
+            self.current = self.open_row(line)
+        elif self.current is not None:
+            if not self.continue_row(self.current, line):
+                self.close_row()
+
+    def record_counts(self):
+        count("lines_scanned", self.lines_scanned)
+        count("lines_skipped", self.lines_skipped)
+        count("lines_matched", self.lines_matched)
+        count("lines_rejected", self.lines_rejected)
+        count("rows_emitted", len(self.rows))
+
+    def close(self):
+        self.close_row()
+        self.record_counts()
+        return self.rows
+
+    def parse(self, lines):
+        for line in lines:
+            if self.stop(line):
+                break
+            self.feed(line)
+        return self.close()
+
+class SingleLineParser(LineStateMachine):
+    def parse_row(self, line):
+        raise NotImplementedError
+
+    def handle(self, line):
+        row = self.parse_row(line)
+        if row is not None:
+            self.lines_matched += 1
+            self.emit(row)
@@ -0,0 +1,144 @@
+import os
+import sys
+import json
+import time
+import argparse
+import cProfile
+import contextlib
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+_active = None
+
+class Metrics:
+    def __init__(self, **labels):
+        self.labels = labels
+        self.spans = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.seconds = None
+
+    @contextlib.contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def stop(self):
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self.started
+        return self
+
+    def to_record(self):
+        self.stop()
+        return {
+            **self.labels,
+            "seconds": round(self.seconds, 6),
+            "spans": {name: round(seconds, 6) for name, seconds in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+@contextlib.contextmanager
+def collecting(metrics):
+    global _active
+    previous, _active = _active, metrics
+    try:
+        yield metrics
+    finally:
+        _active = previous
+
+def span(name):
+    if _active is None:
+        return contextlib.nullcontext()
+    return _active.span(name)
+
+def count(name, n=1):
+    if _active is not None:
+        _active.count(name, n)
+
+def append_metrics(path, record):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def profile_path_for(pdf_path, profile_dir, profiler="cprofile"):
+    stem = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(profile_dir, stem + (".html" if profiler == "pyinstrument" else ".prof"))
+
+@contextlib.contextmanager
+def profiled(path, profiler="cprofile"):
+    if path is None:
+        yield
+        return
+
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            raise RuntimeError("pyinstrument no está instalado; use --profiler cprofile o instálelo con pip install pyinstrument")
+        instrument = Profiler()
+        instrument.start()
+        try:
+            yield
+        finally:
+            instrument.stop()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(instrument.output_html())
+        return
+
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+
+def read_metrics(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def summarize(records):
+    spans = {}
+    counters = {}
+    for record in records:
+        for name, seconds in record.get("spans", {}).items():
+            spans.setdefault(name, []).append(seconds)
+        for name, value in record.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+    return spans, counters
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resume un registro de métricas JSON (una línea por archivo)")
+    parser.add_argument("logs", nargs="+", help="Archivos .jsonl generados con --metrics")
+    args = parser.parse_args(argv)
+
+    records = [record for path in args.logs for record in read_metrics(path)]
+    if not records:
+        print("No hay registros de métricas.")
+        return 1
+
+    spans, counters = summarize(records)
+    errors = sum(1 for record in records if record.get("error"))
+    print(f"{len(records)} archivos, {errors} con error, {sum(r['seconds'] for r in records):.2f} s en total")
+    print(f"{'etapa':<10}{'archivos':>9}{'total s':>10}{'media s':>10}{'p50 s':>9}{'p95 s':>9}{'máx s':>9}")
+    for name, values in sorted(spans.items(), key=lambda item: -sum(item[1])):
+        print(f"{name:<10}{len(values):>9}{sum(values):>10.2f}{sum(values) / len(values):>10.3f}"
+              f"{percentile(values, 0.5):>9.3f}{percentile(values, 0.95):>9.3f}{max(values):>9.3f}")
+    for name, value in sorted(counters.items()):
+        print(f"{name}: {value}")
+
+    slowest = max(records, key=lambda record: record["seconds"])
+    print(f"Más lento: {slowest.get('archivo')} ({slowest['seconds']:.2f} s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import os
+import re
+import glob
+import tomllib
+from functools import lru_cache
+
+CLIENTS_DIR = os.environ.get(
+    "EXTRACTOR_CLIENTES_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "clientes"),
+)
+ALL_BANKS = "todos"
+
+def keyword_trie(keywords):
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return trie
+
+def trie_regex(node):
+    if "" in node:
+        return ""
+    branches = [re.escape(char) + trie_regex(child) for char, child in sorted(node.items())]
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+        self.pattern = re.compile(trie_regex(keyword_trie(self.keywords))) if self.keywords else None
+
+    def __bool__(self):
+        return self.pattern is not None
+
+    def search(self, text):
+        return self.pattern is not None and self.pattern.search(text) is not None
+
+    def filter_lines(self, lines):
+        if self.pattern is None:
+            yield from lines
+            return
+        search = self.pattern.search
+        for line in lines:
+            if search(line) is None:
+                yield line
+
+def client_paths(clients_dir=None):
+    return sorted(glob.glob(os.path.join(clients_dir or CLIENTS_DIR, "*.toml")))
+
+def load_client(path):
+    with open(path, "rb") as f:
+        config = tomllib.load(f)
+    noise = config.get("ruido", {})
+    for bank, keywords in noise.items():
+        if not isinstance(keywords, list) or not all(isinstance(keyword, str) for keyword in keywords):
+            raise ValueError(f"{path}: [ruido].{bank} debe ser una lista de textos")
+    return noise
+
+def client_keywords(bank, client=None, clients_dir=None):
+    if client is None:
+        client = os.environ.get("EXTRACTOR_CLIENTE") or None
+    paths = client_paths(clients_dir)
+    if client is not None:
+        paths = [path for path in paths if os.path.splitext(os.path.basename(path))[0] == client]
+        if not paths:
+            raise ValueError(f"No existe la configuración del cliente {client} en {clients_dir or CLIENTS_DIR}")
+
+    keywords = []
+    for path in paths:
+        noise = load_client(path)
+        keywords += noise.get(ALL_BANKS, []) + noise.get(bank, [])
+    return keywords
+
+@lru_cache(maxsize=None)
+def noise_matcher(bank, client=None, clients_dir=None):
+    from banks import load_registry
+    spec = load_registry().get(bank)
+    bank_keywords = spec.noise_keywords if spec is not None else []
+    return KeywordMatcher(bank_keywords + client_keywords(bank, client, clients_dir))
@@ -0,0 +1,100 @@
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+from lazy import lazy_import
+pdfplumber = lazy_import("pdfplumber")
+
+from extraction import release_page
+from metrics import count, span
+from text_cache import TextCache
+
+DEFAULT_DPI = 200
+DEFAULT_LANG = "spa"
+OCR_CACHE_SUBDIR = "ocr"
+
+def require_tesseract():
+    try:
+        import pytesseract
+    except ImportError:
+        raise RuntimeError("pytesseract no está instalado; instálelo con pip install pytesseract (requiere el programa tesseract)")
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError:
+        raise RuntimeError("No se encontró el programa tesseract; instálelo (por ejemplo, apt install tesseract-ocr tesseract-ocr-spa) o indique su ruta en el PATH")
+    return pytesseract
+
+def ocr_cache_for(cache):
+    if cache is None:
+        return None
+    return TextCache(os.path.join(cache.cache_dir, OCR_CACHE_SUBDIR), cache.max_bytes // (1024 * 1024))
+
+def page_digest(page, dpi, lang):
+    digest = hashlib.sha256()
+    digest.update(f"{page.width}x{page.height}:{dpi}:{lang}".encode())
+    for image in page.images:
+        digest.update(image["stream"].get_rawdata() or b"")
+    return digest.hexdigest()
+
+def is_textless(text):
+    return not text or text.isspace()
+
+def ocr_page(pdf_path, page_number, dpi=DEFAULT_DPI, lang=DEFAULT_LANG):
+    import pytesseract
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    with pdfplumber.open(pdf_path) as pdf:
+        page = pdf.pages[page_number]
+        image = page.to_image(resolution=dpi).original.convert("L")
+        release_page(page)
+    return pytesseract.image_to_string(image, lang=lang).replace("\f", "").rstrip()
+
+def scanned_pages(pdf_path, page_texts, dpi, lang):
+    candidates = {}
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_number, text in enumerate(page_texts):
+            if not is_textless(text):
+                continue
+            page = pdf.pages[page_number]
+            if page.images:
+                candidates[page_number] = page_digest(page, dpi, lang)
+            release_page(page)
+    return candidates
+
+def ocr_missing_pages(pdf_path, page_texts, dpi=DEFAULT_DPI, lang=DEFAULT_LANG, workers=None, cache=None):
+    candidates = scanned_pages(pdf_path, page_texts, dpi, lang)
+    if not candidates:
+        return page_texts
+
+    page_texts = list(page_texts)
+    pending = []
+    for page_number, key in candidates.items():
+        cached = cache.get(key) if cache is not None else None
+        if cached is None:
+            pending.append(page_number)
+        else:
+            page_texts[page_number] = cached[0]
+            count("ocr_cache_hits")
+
+    if pending:
+        require_tesseract()
+        workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        with span("ocr"):
+            if workers == 1:
+                texts = [ocr_page(pdf_path, page_number, dpi, lang) for page_number in pending]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    texts = list(executor.map(ocr_page, [pdf_path] * len(pending), pending, [dpi] * len(pending), [lang] * len(pending)))
+        for page_number, text in zip(pending, texts):
+            page_texts[page_number] = text
+            if cache is not None:
+                cache.put(candidates[page_number], [text])
+        count("pages_ocr", len(pending))
+    return page_texts
+
+def workers_per_file(concurrent_files):
+    return max(1, (os.cpu_count() or 1) // concurrent_files)
+
+def with_ocr_workers(ocr_options, concurrent_files):
+    if ocr_options is None or ocr_options[2] is not None:
+        return ocr_options
+    return (*ocr_options[:2], workers_per_file(concurrent_files))
@@ -0,0 +1,25 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+AMOUNT_PATTERN = re.compile(r'\d{1,3}(?:,\d{3})*\.\d{2}')
+CURRENCY_AMOUNT_PATTERN = re.compile(r'\$\d{1,3}(?:,\d{3})*\.\d{2}')
+PLAIN_AMOUNT_PATTERN = re.compile(r'\d+\.\d{2}')
+
+_find_amount_tokens = AMOUNT_PATTERN.findall
+
+def amount_to_cents(token):
+    return int(token.replace('$', '').replace(',', '').replace('.', ''))
+
+def find_amounts(line):
+    if '.' not in line:
+        return []
+    return [int(token.replace(',', '').replace('.', '')) for token in _find_amount_tokens(line)]
+
+def parse_amount(token):
+    cleaned = token.replace('$', '').replace(',', '')
+    if PLAIN_AMOUNT_PATTERN.fullmatch(cleaned):
+        return int(cleaned.replace(".", ""))
+    try:
+        return int((Decimal(cleaned) * 100).to_integral_value())
+    except (InvalidOperation, OverflowError):
+        raise ValueError(f"Monto inválido: {token!r}")
@@ -0,0 +1,163 @@
+import re
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+
+from lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+from classify import BALANCE_COLUMN, OPENING_BALANCE_COLUMN, RECONCILIATION_COLUMN
+from banks import bank_names
+from extraction import iter_page_texts
+from writers import COLUMN_ALIASES
+
+YEAR_PAGES = 2
+NORMALIZED_COLUMNS = ["Banco", "Archivo", "Fecha", "Fecha Original", "Concepto", "Retiro", "Depósito", "Saldo", RECONCILIATION_COLUMN]
+AMOUNT_COLUMNS = ["Retiro", "Depósito", "Saldo"]
+CENT = Decimal("0.01")
+
+NORMALIZED_TYPES = {
+    "Banco": "string", "Archivo": "string", "Fecha": "date", "Fecha Original": "string", "Concepto": "string",
+    "Retiro": "decimal", "Depósito": "decimal", "Saldo": "decimal", RECONCILIATION_COLUMN: "bool",
+}
+SUMMARY_COLUMNS = [
+    "Banco", "Archivo", "Movimientos", "Desde", "Hasta", "Saldo Inicial", "Depósitos", "Retiros",
+    "Saldo Final", "Saldo Esperado", "Diferencia", "Estado",
+]
+SUMMARY_TYPES = {
+    "Banco": "string", "Archivo": "string", "Movimientos": "int", "Desde": "date", "Hasta": "date",
+    "Saldo Inicial": "decimal", "Depósitos": "decimal", "Retiros": "decimal", "Saldo Final": "decimal",
+    "Saldo Esperado": "decimal", "Diferencia": "decimal", "Estado": "string",
+}
+
+MONTH_NUMBERS = {
+    "ENE": 1, "FEB": 2, "MAR": 3, "ABR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AGO": 8, "SEP": 9, "SET": 9, "OCT": 10, "NOV": 11, "DIC": 12,
+    "JAN": 1, "APR": 4, "AUG": 8, "DEC": 12,
+}
+YEAR_PATTERN = re.compile(r'\b(20\d{2})\b')
+FECHA_PATTERNS = [
+    (re.compile(r'^(\d{4})-(\d{2})-(\d{2})$'), ("year", "month", "day")),
+    (re.compile(r'^(\d{1,2})[-/ ]([A-Za-zÁÉÍÓÚáéíóú]{3,})[-/ ](\d{4}|\d{2})$'), ("day", "month", "year")),
+    (re.compile(r'^(\d{1,2})[-/ ]([A-Za-zÁÉÍÓÚáéíóú]{3,})$'), ("day", "month")),
+    (re.compile(r'^([A-Za-zÁÉÍÓÚáéíóú]{3,})[-/ ](\d{1,2})$'), ("month", "day")),
+    (re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})$'), ("day", "month", "year")),
+]
+
+def month_number(token):
+    if token.isdigit():
+        return int(token)
+    return MONTH_NUMBERS.get(token[:3].upper())
+
+def parse_fecha(text, year=None):
+    text = str(text).strip()
+    for pattern, fields in FECHA_PATTERNS:
+        match = pattern.match(text)
+        if not match:
+            continue
+        parts = dict(zip(fields, match.groups()))
+        month = month_number(parts["month"])
+        parsed_year = int(parts["year"]) if "year" in parts else year
+        if parsed_year is not None and parsed_year < 100:
+            parsed_year += 2000
+        if month is None or parsed_year is None:
+            return None
+        try:
+            return date(parsed_year, month, int(parts["day"])).isoformat()
+        except ValueError:
+            return None
+    return None
+
+def statement_year(pdf_path, page_texts=None, max_pages=YEAR_PAGES):
+    years = Counter()
+    for text in page_texts[:max_pages] if page_texts else iter_page_texts(pdf_path, 0, max_pages):
+        years.update(int(year) for year in YEAR_PATTERN.findall(text))
+    return years.most_common(1)[0][0] if years else None
+
+def needs_year(df):
+    df = df.rename(columns=COLUMN_ALIASES)
+    if "Fecha" not in df:
+        return False
+    return any(parse_fecha(fecha) is None for fecha in df["Fecha"].astype(str).head(20))
+
+def parse_fechas(fechas, year=None):
+    parsed = {fecha: parse_fecha(fecha, year) for fecha in fechas.unique()}
+    return pd.to_datetime(fechas.map(parsed), format="ISO8601", errors="coerce")
+
+@lru_cache(maxsize=None)
+def bank_dtype():
+    return pd.CategoricalDtype(bank_names())
+
+def amount_cents(values):
+    if pd.api.types.is_integer_dtype(values):
+        return values.astype("Int64", copy=False)
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_numeric(values.astype(str).str.replace(',', '').str.replace('$', ''), errors="coerce")
+    return pd.Series(np.round(values.to_numpy(dtype=float, na_value=np.nan) * 100)).astype("Int64")
+
+def normalize_movements(df, bank, archivo, year=None):
+    df = df.rename(columns=COLUMN_ALIASES).reset_index(drop=True)
+    if "Saldo" not in df and BALANCE_COLUMN in df:
+        df = df.rename(columns={BALANCE_COLUMN: "Saldo"})
+    n = len(df)
+    missing = pd.Series([None] * n, dtype=object)
+    fechas = df["Fecha"].astype(str).str.strip() if "Fecha" in df else pd.Series([""] * n)
+    descuadre = df[RECONCILIATION_COLUMN] if RECONCILIATION_COLUMN in df else missing
+    return pd.DataFrame({
+        "Banco": pd.Categorical([bank] * n, dtype=bank_dtype()),
+        "Archivo": archivo,
+        "Fecha": parse_fechas(fechas, year),
+        "Fecha Original": fechas,
+        "Concepto": df["Concepto"].astype(str).str.strip() if "Concepto" in df else missing,
+        **{column: amount_cents(df[column] if column in df else missing) for column in AMOUNT_COLUMNS},
+        RECONCILIATION_COLUMN: descuadre.astype("boolean"),
+        OPENING_BALANCE_COLUMN: amount_cents(df[OPENING_BALANCE_COLUMN] if OPENING_BALANCE_COLUMN in df else missing),
+    }, columns=[*NORMALIZED_COLUMNS, OPENING_BALANCE_COLUMN])
+
+def cents_to_decimal(values):
+    return [None if value is pd.NA else (Decimal(int(value)) * CENT) for value in values]
+
+def export_frame(df, columns=None):
+    columns = columns or list(df.columns)
+    out = {}
+    for column in columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.Int64Dtype):
+            out[column] = cents_to_decimal(values)
+        elif pd.api.types.is_datetime64_any_dtype(values):
+            out[column] = [None if pd.isna(value) else value.date() for value in values]
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            out[column] = values.astype(str)
+        elif isinstance(values.dtype, pd.BooleanDtype):
+            out[column] = values.astype(object).where(values.notna(), None)
+        else:
+            out[column] = values
+    return pd.DataFrame(out, columns=columns)
+
+def reconciliation_summary(df):
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    df = df.assign(Retiro=df["Retiro"].fillna(0), Depósito=df["Depósito"].fillna(0))
+    grouped = df.groupby(["Banco", "Archivo"], observed=True, sort=True)
+    first = grouped.nth(0).set_index(["Banco", "Archivo"])
+    summary = pd.DataFrame({
+        "Movimientos": grouped.size(),
+        "Desde": grouped["Fecha"].min(),
+        "Hasta": grouped["Fecha"].max(),
+        "Depósitos": grouped["Depósito"].sum(),
+        "Retiros": grouped["Retiro"].sum(),
+        "Saldo Final": grouped["Saldo"].last(),
+    })
+    summary["Saldo Inicial"] = first[OPENING_BALANCE_COLUMN].fillna(first["Saldo"] - first["Depósito"] + first["Retiro"])
+    summary["Saldo Esperado"] = summary["Saldo Inicial"] + summary["Depósitos"] - summary["Retiros"]
+    summary["Diferencia"] = summary["Saldo Final"] - summary["Saldo Esperado"]
+    summary["Estado"] = np.select(
+        [summary["Saldo Final"].isna().to_numpy() | summary["Saldo Inicial"].isna().to_numpy(),
+         (summary["Diferencia"] == 0).fillna(False).to_numpy()],
+        ["sin saldo", "cuadra"],
+        "descuadre",
+    )
+    return summary.reset_index()[SUMMARY_COLUMNS]
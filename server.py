@@ -0,0 +1,343 @@
+import io
+import os
+import csv
+import sys
+import json
+import time
+import signal
+import asyncio
+import tempfile
+import multiprocessing
+from datetime import date
+from decimal import Decimal
+from email import policy
+from email.parser import BytesParser
+from urllib.parse import parse_qs, urlsplit
+from concurrent.futures import ProcessPoolExecutor
+
+from lazy import HEAVY_MODULES, preload
+from analyzerV2 import BANK_PARSERS
+from batch import run_statement
+from detect import AUTO_BANK
+from metrics import append_metrics
+from ocr import with_ocr_workers
+from schema import NORMALIZED_COLUMNS, SUMMARY_COLUMNS, export_frame, reconciliation_summary
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_UPLOAD_MB = 50
+MAX_HEADER_BYTES = 64 * 1024
+ROWS_PER_CHUNK = 500
+DEFAULT_FILENAME = "estado.pdf"
+RESPONSE_FORMATS = ("json", "ndjson", "csv")
+CONTENT_TYPES = {
+    "json": "application/json; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def json_value(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+def warm_worker():
+    import analyzerV2
+    import batch
+    preload(*HEAVY_MODULES)
+
+def extract_statement(pdf_path, bank, year, options):
+    result = run_statement(pdf_path, bank, normalized=True, year=year, **options)
+    result["Métricas"] = result["Métricas"].to_record()
+    normalized = result.pop("Normalizado", None)
+    if normalized is not None:
+        rows = export_frame(normalized, NORMALIZED_COLUMNS).itertuples(index=False, name=None)
+        result["Filas"] = [tuple(json_value(value) for value in row) for row in rows]
+        summary = export_frame(reconciliation_summary(normalized), SUMMARY_COLUMNS)
+        result["Resumen"] = {column: json_value(value) for column, value in zip(SUMMARY_COLUMNS, next(summary.itertuples(index=False, name=None)))}
+    return result
+
+async def read_request_head(reader):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise HttpError(431, "Encabezados demasiado grandes")
+    except asyncio.IncompleteReadError:
+        raise ConnectionError("conexión cerrada antes de la solicitud")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Solicitud HTTP inválida")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), target, headers
+
+async def read_body(reader, writer, headers, max_bytes):
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(411, "Envíe el PDF con Content-Length")
+    try:
+        length = int(headers["content-length"])
+    except (KeyError, ValueError):
+        raise HttpError(411, "Falta Content-Length")
+    if length > max_bytes:
+        raise HttpError(413, f"El archivo supera el máximo de {max_bytes // (1024 * 1024)} MB")
+    if headers.get("expect", "").lower() == "100-continue":
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        await writer.drain()
+    return await reader.readexactly(length)
+
+def safe_filename(filename):
+    name = os.path.basename((filename or "").replace("\\", "/"))
+    return name if name and not name.startswith(".") else DEFAULT_FILENAME
+
+def upload_from(body, content_type, query):
+    if not content_type.lower().startswith("multipart/form-data"):
+        return safe_filename(query.get("filename")), body, {}
+    message = BytesParser(policy=policy.HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+    fields, upload = {}, None
+    for part in message.iter_parts() if message.is_multipart() else ():
+        filename = part.get_filename()
+        if filename is None:
+            fields[part.get_param("name", header="content-disposition")] = part.get_payload(decode=True).decode("utf-8", "replace").strip()
+        elif upload is None:
+            upload = (safe_filename(filename), part.get_payload(decode=True))
+    if upload is None:
+        raise HttpError(400, "La solicitud no incluye un archivo PDF")
+    return (*upload, fields)
+
+async def send_head(writer, status, headers):
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", "Connection: close", *(f"{name}: {value}" for name, value in headers.items())]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await writer.drain()
+
+async def send_json(writer, status, payload, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    await send_head(writer, status, {"Content-Type": CONTENT_TYPES["json"], "Content-Length": len(body), **(headers or {})})
+    writer.write(body)
+    await writer.drain()
+
+def iter_body(output, result, rows_per_chunk=ROWS_PER_CHUNK):
+    rows = result["Filas"]
+    chunks = (rows[start:start + rows_per_chunk] for start in range(0, len(rows), rows_per_chunk))
+    if output == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(NORMALIZED_COLUMNS)
+        for chunk in chunks:
+            writer.writerows(["" if value is None else value for value in row] for row in chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+        return
+
+    def records(chunk):
+        return [json.dumps(dict(zip(NORMALIZED_COLUMNS, row)), ensure_ascii=False) for row in chunk]
+
+    if output == "ndjson":
+        for chunk in chunks:
+            yield "\n".join(records(chunk)) + "\n"
+        return
+    header = {"Archivo": os.path.basename(result["Archivo"]), "Banco": result["Banco"], "Resumen": result["Resumen"]}
+    yield json.dumps(header, ensure_ascii=False)[:-1] + ', "Movimientos": ['
+    separator = "\n"
+    for chunk in chunks:
+        yield separator + ",\n".join(records(chunk))
+        separator = ",\n"
+    yield "\n]}"
+
+async def send_movements(writer, output, result):
+    await send_head(writer, 200, {
+        "Content-Type": CONTENT_TYPES[output],
+        "Transfer-Encoding": "chunked",
+        "X-Banco": result["Banco"],
+        "X-Movimientos": len(result["Filas"]),
+        "X-Conciliacion": result["Resumen"]["Estado"],
+    })
+    for text in iter_body(output, result):
+        data = text.encode()
+        writer.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+class ExtractionServer:
+    def __init__(self, executor, options, concurrency, queue_size, max_bytes, metrics_log=None):
+        self.executor = executor
+        self.options = options
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_bytes = max_bytes
+        self.metrics_log = metrics_log
+        self.slots = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.served = 0
+        self.rejected = 0
+
+    def status(self):
+        return {
+            "estado": "ok",
+            "procesos": self.concurrency,
+            "en_proceso": self.active,
+            "en_espera": self.waiting,
+            "cola": self.queue_size,
+            "atendidas": self.served,
+            "rechazadas": self.rejected,
+        }
+
+    async def handle(self, reader, writer):
+        start = time.perf_counter()
+        status, label = None, ""
+        try:
+            method, target, headers = await read_request_head(reader)
+            label = f"{method} {urlsplit(target).path}"
+            status, detail = await self.route(method, target, headers, reader, writer)
+            label = f"{label} {detail}".rstrip()
+        except HttpError as e:
+            status = e.status
+            if status == 503:
+                self.rejected += 1
+            await send_json(writer, status, {"error": str(e)}, {"Retry-After": 1} if status == 503 else None)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+        if status is not None:
+            print(f"{status} {label} {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    async def route(self, method, target, headers, reader, writer):
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                raise HttpError(405, "Use GET para consultar el estado del servicio")
+            await send_json(writer, 200, self.status())
+            return 200, ""
+        if url.path != "/extract":
+            raise HttpError(404, f"Ruta desconocida: {url.path} (use POST /extract o GET /health)")
+        if method != "POST":
+            raise HttpError(405, "Use POST para enviar el PDF")
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        return await self.extract(query, headers, reader, writer)
+
+    async def read_upload(self, query, headers, reader, writer):
+        body = await read_body(reader, writer, headers, self.max_bytes)
+        filename, pdf_bytes, fields = upload_from(body, headers.get("content-type", ""), query)
+        params = {**fields, **query}
+
+        bank = params.get("bank", AUTO_BANK).upper()
+        if bank != AUTO_BANK and bank not in BANK_PARSERS:
+            raise HttpError(400, f"Banco desconocido: {bank} (use {AUTO_BANK} o uno de {', '.join(BANK_PARSERS)})")
+        output = params.get("format", "json").lower()
+        if output not in RESPONSE_FORMATS:
+            raise HttpError(400, f"Formato desconocido: {output} (use {', '.join(RESPONSE_FORMATS)})")
+        try:
+            year = int(params["year"]) if params.get("year") else None
+        except ValueError:
+            raise HttpError(400, f"Año inválido: {params['year']}")
+        if b"%PDF" not in pdf_bytes[:1024]:
+            raise HttpError(400, "El archivo enviado no es un PDF")
+        return filename, pdf_bytes, bank, output, year
+
+    async def extract(self, query, headers, reader, writer):
+        if self.active + self.waiting >= self.concurrency + self.queue_size:
+            raise HttpError(503, "Servidor ocupado: la cola de solicitudes está llena, intente de nuevo")
+
+        self.waiting += 1
+        queued = True
+        try:
+            filename, pdf_bytes, bank, output, year = await self.read_upload(query, headers, reader, writer)
+            with tempfile.TemporaryDirectory(prefix="extractor-") as tmp:
+                pdf_path = os.path.join(tmp, filename)
+                with open(pdf_path, "wb") as f:
+                    f.write(pdf_bytes)
+                del pdf_bytes
+
+                await self.slots.acquire()
+                self.waiting -= 1
+                queued = False
+                self.active += 1
+                try:
+                    result = await asyncio.get_running_loop().run_in_executor(self.executor, extract_statement, pdf_path, bank, year, self.options)
+                finally:
+                    self.active -= 1
+                    self.slots.release()
+        finally:
+            if queued:
+                self.waiting -= 1
+
+        self.served += 1
+        if self.metrics_log:
+            append_metrics(self.metrics_log, result["Métricas"])
+        if result["Error"]:
+            raise HttpError(422, result["Error"])
+        await send_movements(writer, output, result)
+        return 200, f"{filename} ({result['Banco']}): {len(result['Filas'])} movimientos"
+
+async def serve(host, port, concurrency, queue_size, max_bytes, options, metrics_log=None):
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    with ProcessPoolExecutor(max_workers=concurrency, mp_context=multiprocessing.get_context("spawn"), initializer=warm_worker) as executor:
+        await asyncio.gather(*(loop.run_in_executor(executor, os.getpid) for _ in range(concurrency)))
+        service = ExtractionServer(executor, options, concurrency, queue_size, max_bytes, metrics_log)
+        server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER_BYTES)
+        address = server.sockets[0].getsockname()
+        print(f"Servicio de extracción en http://{address[0]}:{address[1]} con {concurrency} procesos y cola de {queue_size} solicitudes")
+        sys.stdout.flush()
+        async with server:
+            await stop.wait()
+        while service.active or service.waiting:
+            await asyncio.sleep(0.1)
+    print(f"Servicio detenido: {service.served} solicitudes atendidas, {service.rejected} rechazadas.")
+    return service
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, concurrency=None, queue_size=None, max_mb=MAX_UPLOAD_MB, cache_options=None,
+               section_only=False, engine="text", ocr_options=None, metrics_log=None):
+    concurrency = concurrency or os.cpu_count() or 1
+    queue_size = 2 * concurrency if queue_size is None else queue_size
+    ocr_options = with_ocr_workers(ocr_options, concurrency)
+    options = {
+        "cache_options": cache_options,
+        "section_only": section_only,
+        "engine": engine,
+        "ocr_options": ocr_options,
+    }
+    return asyncio.run(serve(host, port, concurrency, queue_size, max_mb * 1024 * 1024, options, metrics_log))
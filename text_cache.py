@@ -0,0 +1,140 @@
+import os
+import gzip
+import json
+import hashlib
+
+from lazy import lazy_import
+pdfplumber = lazy_import("pdfplumber")
+
+from extraction import TEXT_SETTINGS, extract_page_texts, extract_section_page_texts
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "EXTRACTOR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "extractorBancos"),
+)
+DEFAULT_MAX_MB = 512
+ENTRY_SUFFIX = ".json.gz"
+EVICT_TO = 0.9
+
+_default_cache = None
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class TextCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_mb=DEFAULT_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self.size = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, pdf_path, settings=None, file_digest=None):
+        digest = hashlib.sha256()
+        digest.update((file_digest or file_sha256(pdf_path)).encode())
+        digest.update(pdfplumber.__version__.encode())
+        digest.update(json.dumps(settings if settings is not None else TEXT_SETTINGS, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def read(self, key):
+        path = self.entry_path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                page_texts = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return page_texts
+
+    def get(self, key):
+        page_texts = self.read(key)
+        if page_texts is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return page_texts
+
+    def cached_page_texts(self, pdf_path, file_digest=None):
+        return self.read(self.key_for(pdf_path, file_digest=file_digest))
+
+    def detection_key(self, pdf_path, max_pages, file_digest=None):
+        return self.key_for(pdf_path, {"extract_text": TEXT_SETTINGS, "detection": max_pages}, file_digest)
+
+    def cached_detection_texts(self, pdf_path, max_pages, file_digest=None):
+        file_digest = file_digest or file_sha256(pdf_path)
+        return self.cached_page_texts(pdf_path, file_digest) or self.read(self.detection_key(pdf_path, max_pages, file_digest))
+
+    def put_detection_texts(self, pdf_path, max_pages, page_texts, file_digest=None):
+        self.put(self.detection_key(pdf_path, max_pages, file_digest), page_texts)
+
+    def put(self, key, page_texts):
+        path = self.entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(page_texts, f, ensure_ascii=False)
+        added = os.path.getsize(tmp_path)
+        try:
+            added -= os.path.getsize(path)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, path)
+        if self.size is not None:
+            self.size += added
+        if self.size is None or self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self.size = total
+
+    def page_texts(self, pdf_path, workers=1, section=None, first_pages=None, file_digest=None):
+        if section is None:
+            key = self.key_for(pdf_path, file_digest=file_digest)
+        else:
+            key = self.key_for(pdf_path, {"extract_text": TEXT_SETTINGS, "section": list(section)}, file_digest)
+
+        page_texts = self.get(key)
+        if page_texts is None:
+            if section is None:
+                page_texts = extract_page_texts(pdf_path, workers=workers, first_pages=first_pages)
+            else:
+                page_texts = extract_section_page_texts(pdf_path, *section)
+                if page_texts is None:
+                    return None
+            self.put(key, page_texts)
+        return page_texts
+
+def get_text_cache(cache_dir=None, max_mb=None):
+    global _default_cache
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    max_mb = max_mb or DEFAULT_MAX_MB
+    if _default_cache is None or _default_cache.cache_dir != cache_dir or _default_cache.max_bytes != max_mb * 1024 * 1024:
+        _default_cache = TextCache(cache_dir, max_mb)
+    return _default_cache
@@ -0,0 +1,112 @@
+from decimal import Decimal
+
+from lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+from classify import OPENING_BALANCE_COLUMN
+from metrics import span
+
+QUALITY_COLUMNS = ["Banco", "Archivo", "Movimientos", "Con Saldo", "Verificados", "Cortes", "Primer Corte", "Calidad"]
+QUALITY_TYPES = {
+    "Banco": "string", "Archivo": "string", "Movimientos": "int", "Con Saldo": "int", "Verificados": "int",
+    "Cortes": "int", "Primer Corte": "int", "Calidad": "decimal",
+}
+BREAK_COLUMNS = ["Banco", "Archivo", "Fila", "Fecha", "Concepto", "Saldo Anterior", "Retiro", "Depósito", "Saldo Esperado", "Saldo", "Diferencia"]
+BREAK_TYPES = {
+    "Banco": "string", "Archivo": "string", "Fila": "int", "Fecha": "string", "Concepto": "string", "Saldo Anterior": "decimal",
+    "Retiro": "decimal", "Depósito": "decimal", "Saldo Esperado": "decimal", "Saldo": "decimal", "Diferencia": "decimal",
+}
+PERCENT = Decimal("0.01")
+
+def cents_array(values):
+    values = values.astype("Int64")
+    return values.to_numpy(dtype=np.int64, na_value=0), values.isna().to_numpy()
+
+def segment_rows(starts, lengths):
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.arange(lengths.sum()) - offsets + np.repeat(starts, lengths)
+
+def file_segments(df):
+    bank_codes = pd.factorize(df["Banco"])[0]
+    file_codes = pd.factorize(df["Archivo"])[0]
+    starts = np.r_[True, (bank_codes[1:] != bank_codes[:-1]) | (file_codes[1:] != file_codes[:-1])]
+    return np.cumsum(starts) - 1, np.flatnonzero(starts)
+
+def opening_balances(df, file_starts):
+    if OPENING_BALANCE_COLUMN not in df:
+        return np.zeros(len(file_starts), dtype=np.int64), np.zeros(len(file_starts), dtype=bool)
+    openings, opening_missing = cents_array(df[OPENING_BALANCE_COLUMN].take(file_starts))
+    return openings, ~opening_missing
+
+def balance_checks(file_codes, file_starts, retiros, depositos, saldos, has_saldo, openings, has_opening):
+    running = np.r_[0, np.cumsum(depositos - retiros)]
+    known = np.flatnonzero(has_saldo)
+    starts = np.empty_like(known)
+    starts[:1] = 0
+    starts[1:] = known[:-1] + 1
+    previous = saldos[starts - 1]
+    first = np.r_[True, file_codes[known[1:]] != file_codes[known[:-1]]][:len(known)]
+    files = file_codes[known[first]]
+    starts[first] = file_starts[files]
+    previous[first] = openings[files]
+    anchored = ~first
+    anchored[first] = has_opening[files]
+    checked, starts, previous = known[anchored], starts[anchored], previous[anchored]
+    expected = previous + running[checked + 1] - running[starts]
+    return checked, starts, previous, expected
+
+def balance_continuity(df):
+    if df.empty:
+        return pd.DataFrame(columns=QUALITY_COLUMNS), pd.DataFrame(columns=BREAK_COLUMNS)
+
+    with span("validate"):
+        df = df.reset_index(drop=True)
+        file_codes, file_starts = file_segments(df)
+        n_files = len(file_starts)
+        retiros, _ = cents_array(df["Retiro"])
+        depositos, _ = cents_array(df["Depósito"])
+        saldos, saldo_missing = cents_array(df["Saldo"])
+
+        openings, has_opening = opening_balances(df, file_starts)
+
+        checked, starts, previous, expected = balance_checks(file_codes, file_starts, retiros, depositos, saldos, ~saldo_missing,
+                                                             openings, has_opening)
+        broken = saldos[checked] != expected
+
+        lengths = checked - starts + 1
+        verified = np.zeros(len(df), dtype=bool)
+        verified[segment_rows(starts, lengths)] = np.repeat(~broken, lengths)
+
+        rows = np.arange(len(df)) - file_starts[file_codes] + 1
+        break_rows = checked[broken]
+        first_break = np.zeros(n_files, dtype=np.int64)
+        first_break[file_codes[break_rows[::-1]]] = rows[break_rows[::-1]]
+
+        movimientos = np.bincount(file_codes, minlength=n_files)
+        verificados = np.bincount(file_codes, weights=verified, minlength=n_files).astype(np.int64)
+        quality = pd.DataFrame({
+            "Banco": df["Banco"].take(file_starts).astype(str).to_numpy(),
+            "Archivo": df["Archivo"].take(file_starts).to_numpy(),
+            "Movimientos": movimientos,
+            "Con Saldo": np.bincount(file_codes, weights=~saldo_missing, minlength=n_files).astype(np.int64),
+            "Verificados": verificados,
+            "Cortes": np.bincount(file_codes[break_rows], minlength=n_files),
+            "Primer Corte": pd.Series([int(row) if row else None for row in first_break], dtype=object),
+            "Calidad": [(Decimal(int(v)) * 100 / Decimal(int(m))).quantize(PERCENT) for v, m in zip(verificados, movimientos)],
+        }, columns=QUALITY_COLUMNS)
+
+        breaks = pd.DataFrame({
+            "Banco": df["Banco"].take(break_rows).astype(str).to_numpy(),
+            "Archivo": df["Archivo"].take(break_rows).to_numpy(),
+            "Fila": rows[break_rows],
+            "Fecha": df["Fecha Original"].take(break_rows).to_numpy(),
+            "Concepto": df["Concepto"].take(break_rows).to_numpy(),
+            "Saldo Anterior": pd.array(previous[broken], dtype="Int64"),
+            "Retiro": pd.array(retiros[break_rows], dtype="Int64"),
+            "Depósito": pd.array(depositos[break_rows], dtype="Int64"),
+            "Saldo Esperado": pd.array(expected[broken], dtype="Int64"),
+            "Saldo": pd.array(saldos[break_rows], dtype="Int64"),
+            "Diferencia": pd.array(saldos[break_rows] - expected[broken], dtype="Int64"),
+        }, columns=BREAK_COLUMNS)
+    return quality, breaks
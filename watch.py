@@ -0,0 +1,199 @@
+import os
+import sys
+import time
+import shutil
+import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from batch import run_statement
+from lazy import HEAVY_MODULES, preload
+from metrics import append_metrics
+from ocr import with_ocr_workers
+
+POLL_SECONDS = 1.0
+SETTLE_SECONDS = 2.0
+DONE_DIR = "procesados"
+FAILED_DIR = "errores"
+IGNORED_PREFIXES = (".", "~")
+
+def warm_worker():
+    import batch
+    import geometry
+    preload(*HEAVY_MODULES)
+    try:
+        import xlsxwriter
+    except ImportError:
+        pass
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        pass
+
+def is_statement(path):
+    name = os.path.basename(path)
+    return name.lower().endswith(".pdf") and not name.startswith(IGNORED_PREFIXES)
+
+class Inbox:
+    def __init__(self, settle_seconds=SETTLE_SECONDS):
+        self.settle_seconds = settle_seconds
+        self.candidates = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def add(self, path):
+        if is_statement(path):
+            with self.lock:
+                self.candidates.setdefault(os.path.abspath(path), None)
+
+    def discard(self, path):
+        with self.lock:
+            self.candidates.pop(path, None)
+
+    def ready(self):
+        now = time.monotonic()
+        stable = []
+        with self.lock:
+            for path, seen in list(self.candidates.items()):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    del self.candidates[path]
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if seen is None or seen[0] != signature:
+                    self.candidates[path] = (signature, now)
+                elif now - seen[1] >= self.settle_seconds and stat.st_size > 0:
+                    stable.append(path)
+        return sorted(stable, key=lambda path: self.candidates[path][1])
+
+def scan_inbox(in_dir, inbox, busy=()):
+    for entry in os.scandir(in_dir):
+        if entry.is_file() and os.path.abspath(entry.path) not in busy:
+            inbox.add(entry.path)
+
+def start_watchdog(in_dir, inbox):
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class InboxHandler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory:
+                inbox.add(event.src_path)
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                inbox.add(event.src_path)
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                inbox.add(event.dest_path)
+
+    observer = Observer()
+    observer.schedule(InboxHandler(), in_dir, recursive=False)
+    observer.start()
+    return observer
+
+def unique_path(directory, name):
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        return path
+    stem, extension = os.path.splitext(name)
+    return os.path.join(directory, f"{stem}.{time.strftime('%Y%m%d-%H%M%S')}{extension}")
+
+def archive_statement(pdf_path, directory, error=None):
+    target = unique_path(directory, os.path.basename(pdf_path))
+    shutil.move(pdf_path, target)
+    if error:
+        with open(target + ".error.txt", "w", encoding="utf-8") as f:
+            f.write(error)
+    return target
+
+def install_stop_handlers(stop):
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+def run_watch(bank, in_dir, out_dir, workers=None, output_format=".xlsx", cache_options=None, section_only=False, engine="text",
+              metrics_log=None, ocr_options=None, poll_seconds=POLL_SECONDS, settle_seconds=SETTLE_SECONDS, max_pending=None,
+              once=False, stop=None):
+    done_dir = os.path.join(in_dir, DONE_DIR)
+    failed_dir = os.path.join(in_dir, FAILED_DIR)
+    for directory in (out_dir, done_dir, failed_dir):
+        os.makedirs(directory, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    ocr_options = with_ocr_workers(ocr_options, workers)
+    options = {
+        "bank": bank,
+        "out_dir": out_dir,
+        "output_format": output_format,
+        "cache_options": cache_options,
+        "section_only": section_only,
+        "engine": engine,
+        "ocr_options": ocr_options,
+    }
+
+    stop = stop or threading.Event()
+    install_stop_handlers(stop)
+    inbox = Inbox(settle_seconds)
+    in_flight = {}
+    totals = {"ok": 0, "error": 0}
+
+    observer = None if once else start_watchdog(in_dir, inbox)
+    mode = "una pasada" if once else ("watchdog" if observer is not None else f"sondeo cada {poll_seconds:g} s")
+    print(f"Vigilando {in_dir} ({mode}) con {workers} procesos, hasta {max_pending} archivos en curso. Salida: {out_dir}")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=warm_worker) as executor:
+            scan_inbox(in_dir, inbox)
+            while not stop.is_set():
+                if observer is None and not once:
+                    scan_inbox(in_dir, inbox, in_flight.values())
+
+                for pdf_path in inbox.ready():
+                    if len(in_flight) >= max_pending:
+                        break
+                    inbox.discard(pdf_path)
+                    in_flight[executor.submit(run_statement, pdf_path, **options)] = pdf_path
+
+                if once and not in_flight and not inbox:
+                    break
+                if not in_flight:
+                    stop.wait(poll_seconds if not once else min(poll_seconds, settle_seconds))
+                    continue
+
+                finished, _ = wait(in_flight, timeout=poll_seconds, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    pdf_path = in_flight.pop(future)
+                    handle_result(future.result(), pdf_path, done_dir, failed_dir, metrics_log, totals)
+            for future in list(in_flight):
+                handle_result(future.result(), in_flight.pop(future), done_dir, failed_dir, metrics_log, totals)
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+    print(f"Vigilancia detenida: {totals['ok']} correctos, {totals['error']} con error.")
+    return totals
+
+def handle_result(result, pdf_path, done_dir, failed_dir, metrics_log, totals):
+    metrics = result.pop("Métricas")
+    name = os.path.basename(pdf_path)
+    if metrics_log:
+        append_metrics(metrics_log, metrics.to_record())
+    if result["Error"]:
+        totals["error"] += 1
+        archive_statement(pdf_path, failed_dir, result.get("Detalle") or result["Error"])
+        print(f"ERROR {name}: {result['Error']}", file=sys.stderr)
+        return
+    totals["ok"] += 1
+    archive_statement(pdf_path, done_dir)
+    print(f"{name} ({result['Banco']}): {result['Movimientos']} movimientos -> {result['Salida']}")
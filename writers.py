@@ -0,0 +1,226 @@
+import os
+import csv
+import importlib.util
+
+from lazy import lazy_import
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+from classify import INTERNAL_COLUMNS
+
+OUTPUT_FORMATS = (".xlsx", ".csv", ".parquet")
+MAX_EXCEL_ROWS = 1_048_576
+CHUNK_ROWS = 10_000
+
+COLUMN_ALIASES = {
+    "Fecha Operación": "Fecha",
+    "Operación": "Fecha",
+    "Descripción": "Concepto",
+    "Cargo": "Retiro",
+    "Cargos": "Retiro",
+    "Abono": "Depósito",
+    "Abonos": "Depósito",
+}
+
+def output_frame(df):
+    df = df.drop(columns=[column for column in INTERNAL_COLUMNS if column in df.columns])
+    legacy = {}
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_integer_dtype(values):
+            legacy[column] = values.to_numpy(dtype=float, na_value=np.nan) / 100
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            legacy[column] = values.to_numpy(dtype=object)
+    return df.assign(**legacy)
+
+def cell_value(value):
+    if value is None or value != value:
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+def arrow_type(name):
+    import pyarrow as pa
+    return {
+        "string": pa.string(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "decimal": pa.decimal128(18, 2),
+    }[name]
+
+class MovementWriter:
+    def __init__(self, path, columns=None, column_types=None):
+        self.path = path
+        self.columns = list(columns) if columns is not None else None
+        self.column_types = column_types
+        self.rows_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write_header(self, columns):
+        pass
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+    def write_frame(self, df):
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self.write_header(self.columns)
+        else:
+            df = df.reindex(columns=self.columns)
+        self.write_rows(df.itertuples(index=False, name=None))
+
+    def close(self):
+        pass
+
+class CsvMovementWriter(MovementWriter):
+    def __init__(self, path, columns=None, column_types=None):
+        super().__init__(path, columns, column_types)
+        self.file = open(path, "w", newline="", encoding="utf-8-sig")
+        self.writer = csv.writer(self.file)
+        if self.columns is not None:
+            self.write_header(self.columns)
+
+    def write_header(self, columns):
+        self.writer.writerow(columns)
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.writer.writerow(["" if cell_value(value) is None else value for value in row])
+            self.rows_written += 1
+
+    def close(self):
+        self.file.close()
+
+class XlsxMovementWriter(MovementWriter):
+    def __init__(self, path, columns=None, column_types=None):
+        super().__init__(path, columns, column_types)
+        import xlsxwriter
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "nan_inf_to_errors": True, "default_date_format": "dd/mm/yyyy"})
+        self.worksheet = None
+        self.sheet_row = 0
+        if self.columns is not None:
+            self.write_header(self.columns)
+
+    def write_header(self, columns):
+        self.worksheet = self.workbook.add_worksheet()
+        self.worksheet.write_row(0, 0, columns)
+        self.sheet_row = 1
+
+    def write_rows(self, rows):
+        for row in rows:
+            if self.sheet_row >= MAX_EXCEL_ROWS:
+                self.write_header(self.columns)
+            self.worksheet.write_row(self.sheet_row, 0, [cell_value(value) for value in row])
+            self.sheet_row += 1
+            self.rows_written += 1
+
+    def close(self):
+        if self.worksheet is None:
+            self.workbook.add_worksheet()
+        self.workbook.close()
+
+class OpenpyxlMovementWriter(MovementWriter):
+    def __init__(self, path, columns=None, column_types=None):
+        super().__init__(path, columns, column_types)
+        from openpyxl import Workbook
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = None
+        self.sheet_row = 0
+        if self.columns is not None:
+            self.write_header(self.columns)
+
+    def write_header(self, columns):
+        self.worksheet = self.workbook.create_sheet()
+        self.worksheet.append(columns)
+        self.sheet_row = 1
+
+    def write_rows(self, rows):
+        for row in rows:
+            if self.sheet_row >= MAX_EXCEL_ROWS:
+                self.write_header(self.columns)
+            self.worksheet.append([cell_value(value) for value in row])
+            self.sheet_row += 1
+            self.rows_written += 1
+
+    def close(self):
+        if self.worksheet is None:
+            self.workbook.create_sheet()
+        self.workbook.save(self.path)
+
+class ParquetMovementWriter(MovementWriter):
+    def __init__(self, path, columns=None, column_types=None):
+        super().__init__(path, columns, column_types)
+        self.writer = None
+
+    def write_frame(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.columns is None:
+            self.columns = list(df.columns)
+        df = df.reindex(columns=self.columns)
+
+        if self.writer is None and self.column_types is not None:
+            schema = pa.schema([(column, arrow_type(self.column_types[column])) for column in self.columns])
+            table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.path, schema)
+        elif self.writer is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            schema = table.schema
+            for i, field in enumerate(schema):
+                if pa.types.is_null(field.type):
+                    schema = schema.set(i, field.with_type(pa.string()))
+            table = table.cast(schema)
+            self.writer = pq.ParquetWriter(self.path, schema)
+        else:
+            table = pa.Table.from_pandas(df, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+        self.rows_written += len(df)
+
+    def write_rows(self, rows):
+        self.write_frame(pd.DataFrame(list(rows), columns=self.columns))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+WRITERS = {
+    ".xlsx": XlsxMovementWriter,
+    ".csv": CsvMovementWriter,
+    ".parquet": ParquetMovementWriter,
+}
+
+def open_writer(path, columns=None, column_types=None):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Formato de salida no soportado: {extension or path} (use {', '.join(OUTPUT_FORMATS)})")
+    writer_class = WRITERS[extension]
+    if writer_class is XlsxMovementWriter and importlib.util.find_spec("xlsxwriter") is None:
+        writer_class = OpenpyxlMovementWriter
+    return writer_class(path, columns, column_types)
+
+def temporary_path_for(path):
+    directory, name = os.path.split(path)
+    stem, extension = os.path.splitext(name)
+    return os.path.join(directory, f".{stem}.{os.getpid()}.tmp{extension}")
+
+def write_movements(df, path):
+    tmp_path = temporary_path_for(path)
+    try:
+        with open_writer(tmp_path) as writer:
+            for start in range(0, max(len(df), 1), CHUNK_ROWS):
+                writer.write_frame(output_frame(df.iloc[start:start + CHUNK_ROWS]))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path